@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Solve one day for many input files in parallel.
+
+Usage: ``python3 -m aoc.batch day INPUT ... [--jobs N] [--cache]``
+
+Each INPUT may be a file, a directory (every file in it) or a glob. One
+JSON object per input is printed as soon as it is solved, and the
+throughput is reported on stderr at the end.
+
+"""
+from __future__ import annotations
+
+import json
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from glob import glob
+from os.path import isdir, isfile, join
+from time import perf_counter
+from typing import Any, Iterator, Optional
+from unittest import TestCase
+
+from aoc import results
+from aoc.days import DAYS
+from aoc.testing import temporary_directory
+
+
+def expand(patterns: list[str]) -> list[str]:
+    """Resolve files, directories and globs to a sorted list of files."""
+    paths = set()
+    for pattern in patterns:
+        if isdir(pattern):
+            paths.update(path for path in glob(join(pattern, "*")) if isfile(path))
+        else:
+            paths.update(path for path in glob(pattern) if isfile(path))
+    return sorted(paths)
+
+
+def solve(name: str, path: str, cache: bool = False) -> dict[str, Any]:
+    day = DAYS[name]
+    start = perf_counter()
+    try:
+        result = results.cached_run(day, path) if cache else day.run(path)
+    except Exception as error:
+        return dict(input=path, error=f"{type(error).__name__}: {error}", wall=perf_counter() - start)
+    return dict(input=path, result=result, wall=perf_counter() - start)
+
+
+def run_batch(
+    name: str,
+    paths: list[str],
+    *,
+    jobs: Optional[int] = None,
+    cache: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Yield each input's outcome as soon as a worker finishes it."""
+    if name not in DAYS:
+        raise ValueError(f"unknown day: {name}")
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(solve, name, path, cache) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def parse_args(argv: list[str]):
+    parser = ArgumentParser(prog="python3 -m aoc.batch", description=__doc__.split("\n")[0])
+    parser.add_argument("day", choices=sorted(DAYS))
+    parser.add_argument("inputs", nargs="+", metavar="input", help="file, directory or glob")
+    parser.add_argument("--jobs", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--cache", action="store_true", help="reuse and store results in the result cache")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> None:
+    options = parse_args(argv)
+    paths = expand(options.inputs)
+    start = perf_counter()
+    failures = 0
+    for outcome in run_batch(options.day, paths, jobs=options.jobs, cache=options.cache):
+        failures += "error" in outcome
+        print(json.dumps(outcome), flush=True)
+    elapsed = perf_counter() - start
+    rate = len(paths) / elapsed if elapsed else 0.0
+    print(
+        f"{len(paths)} inputs ({failures} failed) in {elapsed:.3f}s: {rate:.1f} inputs/s",
+        file=sys.stderr,
+    )
+
+
+class BatchTests(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        for name, content in [
+            ("a.txt", "939\n7,13,x,x,59,x,31,19\n"),
+            ("b.txt", "10\n3,x,7\n"),
+            ("bad.txt", "not a schedule\n"),
+        ]:
+            with open(join(self.directory, name), "w") as f:
+                f.write(content)
+
+    def test_expand(self):
+        self.assertEqual(
+            [join(self.directory, name) for name in ("a.txt", "b.txt", "bad.txt")],
+            expand([self.directory]),
+        )
+        self.assertEqual([join(self.directory, "a.txt")], expand([join(self.directory, "a*")]))
+
+    def test_run_batch(self):
+        outcomes = {
+            outcome["input"]: outcome
+            for outcome in run_batch("day13", expand([self.directory]), jobs=2)
+        }
+        self.assertEqual(295, outcomes[join(self.directory, "a.txt")]["result"])
+        self.assertEqual(6, outcomes[join(self.directory, "b.txt")]["result"])
+        self.assertIn("error", outcomes[join(self.directory, "bad.txt")])
+
+    def test_unknown_day(self):
+        with self.assertRaises(ValueError):
+            list(run_batch("day99", []))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,128 @@
+"""Bounded memoization shared by the recursive solvers."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, NamedTuple, Optional
+from unittest import TestCase
+
+DEFAULT_MAXSIZE = 4096
+
+_MISSING = object()
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: Optional[int]
+
+
+class LRUCache:
+    """Mapping that evicts the least recently used entry beyond maxsize.
+
+    A maxsize of None leaves the cache unbounded.
+
+    """
+
+    def __init__(self, maxsize: Optional[int] = DEFAULT_MAXSIZE):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self), self.maxsize)
+
+
+def memoize(func: Optional[Callable] = None, *, maxsize: Optional[int] = DEFAULT_MAXSIZE):
+    """Cache results by positional arguments, usable bare or with maxsize."""
+    def decorate(func: Callable) -> Callable:
+        cache = LRUCache(maxsize)
+
+        @wraps(func)
+        def wrapper(*args):
+            result = cache.get(args, _MISSING)
+            if result is _MISSING:
+                result = func(*args)
+                cache.put(args, result)
+            return result
+
+        wrapper.cache = cache
+        wrapper.stats = cache.stats
+        wrapper.clear = cache.clear
+        return wrapper
+
+    return decorate if func is None else decorate(func)
+
+
+class MemoizeTests(TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+    def _square(self, value):
+        self.calls.append(value)
+        return value * value
+
+    def test_caches_results(self):
+        square = memoize(self._square)
+        self.assertEqual([4, 4, 9], [square(2), square(2), square(3)])
+        self.assertEqual([2, 3], self.calls)
+        self.assertEqual(CacheStats(1, 2, 0, 2, DEFAULT_MAXSIZE), square.stats())
+
+    def test_caches_falsy_results(self):
+        square = memoize(self._square)
+        square(0)
+        square(0)
+        self.assertEqual([0], self.calls)
+
+    def test_evicts_least_recently_used(self):
+        square = memoize(maxsize=2)(self._square)
+        for value in (1, 2, 1, 3, 1, 2):
+            square(value)
+        self.assertEqual([1, 2, 3, 2], self.calls)
+        self.assertEqual(CacheStats(2, 4, 2, 2, 2), square.stats())
+
+    def test_unbounded(self):
+        square = memoize(maxsize=None)(self._square)
+        for value in range(10):
+            square(value)
+        self.assertEqual(CacheStats(0, 10, 0, 10, None), square.stats())
+
+    def test_clear(self):
+        square = memoize(self._square)
+        square(2)
+        square.clear()
+        square(2)
+        self.assertEqual([2, 2], self.calls)
+        self.assertEqual(CacheStats(0, 1, 0, 1, DEFAULT_MAXSIZE), square.stats())
+
+    def test_rejects_empty_cache(self):
+        with self.assertRaises(ValueError):
+            memoize(maxsize=0)(self._square)
@@ -0,0 +1,150 @@
+"""Registry describing how each day's puzzle is invoked.
+
+Each entry mirrors the ``__main__`` block of the corresponding
+``dayNN/impl.py``: ``read`` turns the input file into the leading
+positional arguments and ``args``/``kwargs`` supply the fixed rest.
+
+"""
+from __future__ import annotations
+
+from glob import glob
+from importlib import import_module
+from os.path import basename, dirname, join
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+from unittest import TestCase
+
+from aoc import inputs
+
+ROOT = dirname(dirname(__file__))
+
+
+class Day(NamedTuple):
+    name: str
+    read: Callable[[str], tuple]
+    args: tuple = ()
+    kwargs: Optional[dict[str, Any]] = None
+
+    @property
+    def input_path(self) -> str:
+        return join(ROOT, self.name, "input.txt")
+
+    @property
+    def source_path(self) -> str:
+        return join(ROOT, self.name, "impl.py")
+
+    @property
+    def puzzle(self) -> Callable[..., Any]:
+        return import_module(f"{self.name}.impl").puzzle
+
+    def load(self, path: Optional[str] = None, *, eager: bool = False) -> tuple[tuple, dict[str, Any]]:
+        """Get the arguments for a puzzle call on the given input file.
+
+        With eager, streamed arguments are read into lists up front, so the
+        puzzle call does no I/O.
+
+        """
+        read = self.read(path or self.input_path)
+        if eager:
+            read = tuple(list(arg) if isinstance(arg, Iterator) else arg for arg in read)
+        return (*read, *self.args), dict(self.kwargs or {})
+
+    def run(self, path: Optional[str] = None) -> Any:
+        args, kwargs = self.load(path)
+        return self.puzzle(*args, **kwargs)
+
+
+def _text(path: str) -> str:
+    with open(path) as f:
+        return f.read().strip()
+
+
+def text(path: str) -> tuple[str]:
+    return (_text(path),)
+
+
+def lines(path: str) -> tuple[list[str]]:
+    return (_text(path).split("\n"),)
+
+
+def integers(path: str) -> tuple[list[int]]:
+    return ([int(line) for line in _text(path).split()],)
+
+
+def streamed_lines(path: str) -> tuple[Iterator[str]]:
+    return (inputs.lines(path),)
+
+
+def streamed_records(path: str) -> tuple[Iterator[str]]:
+    return (inputs.records(path),)
+
+
+def _bus_schedule(path: str) -> tuple[int, list[int]]:
+    arrival, buses = _text(path).split("\n")
+    return int(arrival), [int(bus) for bus in buses.split(",") if bus != "x"]
+
+
+def _starting_numbers(path: str) -> tuple[list[int]]:
+    return ([int(value) for value in _text(path).split(",")],)
+
+
+DAYS: dict[str, Day] = {day.name: day for day in [
+    Day("day01", integers, args=(3,)),
+    Day("day02", streamed_lines),
+    Day("day03", text, args=([(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)],)),
+    Day("day04", streamed_records),
+    Day("day05", text),
+    Day("day06", streamed_records),
+    Day("day07", text, args=("shiny gold",)),
+    Day("day08", lines),
+    Day("day09", integers, args=(25,)),
+    Day("day10", integers),
+    Day("day11", text),
+    Day("day12", text),
+    Day("day13", _bus_schedule),
+    Day("day14", text),
+    Day("day15", _starting_numbers, args=(30_000_000,)),
+    Day("day16", text),
+    Day("day17", text, kwargs=dict(cycles=6, dimensions=4)),
+    Day("day18", streamed_lines),
+    Day("day19", streamed_lines),
+    Day("day20", text),
+    Day("day21", streamed_lines),
+    Day("day22", text),
+    Day("day23", text),
+    Day("day24", text, args=(100,)),
+]}
+
+
+def discover(names: Optional[list[str]] = None) -> list[Day]:
+    """Find the registered days that have an implementation on disk."""
+    found = sorted(basename(dirname(path)) for path in glob(join(ROOT, "day*", "impl.py")))
+    missing = [name for name in names or [] if name not in found]
+    if missing:
+        raise ValueError(f"unknown day(s): {', '.join(missing)}")
+    return [DAYS[name] for name in found if name in DAYS and (not names or name in names)]
+
+
+class DaysTests(TestCase):
+
+    def test_every_implementation_is_registered(self):
+        found = sorted(basename(dirname(path)) for path in glob(join(ROOT, "day*", "impl.py")))
+        self.assertEqual(found, sorted(DAYS))
+
+    def test_discover_filters_by_name(self):
+        self.assertEqual(["day03", "day13"], [day.name for day in discover(["day13", "day03"])])
+
+    def test_discover_rejects_unknown_days(self):
+        with self.assertRaises(ValueError):
+            discover(["day99"])
+
+    def test_load_includes_fixed_arguments(self):
+        args, kwargs = DAYS["day17"].load()
+        self.assertEqual(dict(cycles=6, dimensions=4), kwargs)
+        args, kwargs = DAYS["day24"].load()
+        self.assertEqual(100, args[-1])
+
+    def test_eager_load_reads_streamed_input(self):
+        (lazy,), _ = DAYS["day02"].load()
+        (eager,), _ = DAYS["day02"].load(eager=True)
+        self.assertIsInstance(eager, list)
+        self.assertEqual(list(lazy), eager)
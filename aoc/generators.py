@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""Generate valid, arbitrarily large puzzle inputs for stress testing.
+
+Usage: ``python3 -m aoc.generators day [size] [--seed N] [--output PATH]``
+
+``size`` is the natural count for each day: lines or records for most,
+rows for the grids, tiles for day 20, cards per player for day 22 and
+starting numbers for day 15. Day 23's cups are single digits, so its
+labels are always a shuffle of 1-9. The same seed always gives the same
+input.
+
+"""
+from __future__ import annotations
+
+import sys
+from argparse import ArgumentParser
+from collections import Counter
+from itertools import accumulate, combinations
+from math import isqrt
+from os.path import join
+from random import Random
+from string import ascii_lowercase
+from tempfile import TemporaryDirectory
+from typing import Callable
+from unittest import TestCase
+
+from aoc.days import DAYS
+
+SEED = 2020
+
+
+def _word(index: int, length: int = 4) -> str:
+    """Unique lowercase word for each index below 26 ** length."""
+    letters = []
+    for _ in range(length):
+        index, remainder = divmod(index, 26)
+        letters.append(ascii_lowercase[remainder])
+    return "".join(reversed(letters))
+
+
+def _expenses(rng: Random, size: int) -> str:
+    """A pair and a triple summing to 2020, hidden among larger values."""
+    pair = rng.randint(1, 2019)
+    a, b = sorted(rng.sample(range(1, 2020), 2))
+    values = [pair, 2020 - pair, a, b - a, 2020 - b]
+    values += rng.choices(range(2021, 1_000_000), k=max(0, size - len(values)))
+    rng.shuffle(values)
+    return "\n".join(map(str, values))
+
+
+def _passwords(rng: Random, size: int) -> str:
+    lines = []
+    for _ in range(size):
+        length = rng.randint(5, 20)
+        first = rng.randint(1, length - 1)
+        second = rng.randint(first + 1, length)
+        char = rng.choice(ascii_lowercase)
+        password = "".join(rng.choices(ascii_lowercase[:6] + char * 3, k=length))
+        lines.append(f"{first}-{second} {char}: {password}")
+    return "\n".join(lines)
+
+
+def _grid(rng: Random, rows: int, width: int, density: float) -> str:
+    return "\n".join(
+        "".join("#" if rng.random() < density else "." for _ in range(width))
+        for _ in range(rows)
+    )
+
+
+def _trees(rng: Random, size: int) -> str:
+    return _grid(rng, size, 31, 0.2)
+
+
+def _passports(rng: Random, size: int) -> str:
+    fields = dict(
+        byr=lambda: str(rng.randint(1900, 2010)),
+        iyr=lambda: str(rng.randint(2005, 2025)),
+        eyr=lambda: str(rng.randint(2015, 2035)),
+        hgt=lambda: rng.choice([f"{rng.randint(140, 200)}cm", f"{rng.randint(50, 80)}in", "170"]),
+        hcl=lambda: rng.choice(["#", ""]) + "".join(rng.choices("0123456789abcdef", k=6)),
+        ecl=lambda: rng.choice(["amb", "blu", "brn", "gry", "grn", "hzl", "oth", "xry"]),
+        pid=lambda: "".join(rng.choices("0123456789", k=rng.choice([9, 9, 9, 10]))),
+        cid=lambda: str(rng.randint(1, 350)),
+    )
+    passports = []
+    for _ in range(size):
+        present = [field for field in fields if rng.random() < 0.95]
+        parts = [f"{field}:{fields[field]()}" for field in present]
+        rng.shuffle(parts)
+        lines, line = [], []
+        for part in parts:
+            line.append(part)
+            if rng.random() < 0.3:
+                lines.append(" ".join(line))
+                line = []
+        lines.append(" ".join(line))
+        passports.append("\n".join(filter(None, lines)))
+    return "\n\n".join(passports)
+
+
+def _boarding_passes(rng: Random, size: int) -> str:
+    """Seats with one missing, row codes lengthened beyond 7 for large sizes."""
+    size = max(size, 2)
+    row_bits = max(7, (size + 2).bit_length() - 3)
+    first = rng.randrange(0, (1 << (row_bits + 3)) - size - 1)
+    seats = list(range(first, first + size + 1))
+    seats.pop(rng.randrange(1, size))
+    rng.shuffle(seats)
+    rows, columns = str.maketrans("01", "FB"), str.maketrans("01", "LR")
+    return "\n".join(
+        format(seat >> 3, f"0{row_bits}b").translate(rows)
+        + format(seat & 7, "03b").translate(columns)
+        for seat in seats
+    )
+
+
+def _customs(rng: Random, size: int) -> str:
+    return "\n\n".join(
+        "\n".join(
+            "".join(rng.sample(ascii_lowercase, rng.randint(1, 15)))
+            for _ in range(rng.randint(1, 5))
+        )
+        for _ in range(size)
+    )
+
+
+def _bag_rules(rng: Random, size: int) -> str:
+    """Acyclic rules, each bag containing only bags later in the list."""
+    colours = [f"{_word(index)} {_word(index * 7919 + 3)}" for index in range(max(size, 2))]
+    colours[0] = "shiny gold"
+    rules = []
+    for index, colour in enumerate(colours):
+        later = range(index + 1, len(colours))
+        kinds = rng.choice([1, 2, 3, 4] if index == 0 else [0, 1, 2, 3, 4])
+        contained = sorted(rng.sample(later, min(len(later), kinds)))
+        if contained:
+            contents = ", ".join(
+                f"{count} {colours[other]} {'bag' if count == 1 else 'bags'}"
+                for other, count in ((other, rng.randint(1, 5)) for other in contained)
+            )
+        else:
+            contents = "no other bags"
+        rules.append(f"{colour} bags contain {contents}.")
+    rng.shuffle(rules)
+    return "\n".join(rules)
+
+
+def _boot_code(rng: Random, size: int) -> str:
+    """Program that loops, with exactly one jmp/nop flip that terminates.
+
+    The visited path skips over "trap" instructions that jump back to the
+    start; the bug is a jmp back to the start just before a tail of acc.
+
+    """
+    size = max(size, 3)
+    tail = max(1, size // 10)
+    bug = size - tail - 1
+    program: list[tuple[str, int]] = []
+    while len(program) < bug:
+        index = len(program)
+        kind = rng.random()
+        if kind < 0.4 or index == bug - 1:
+            program.append(("acc", rng.randint(-50, 50)))
+        elif kind < 0.6:
+            program.append(("nop", rng.randrange(bug) - index))
+        else:
+            skip = rng.randint(2, min(5, bug - index))
+            program.append(("jmp", skip))
+            program.extend(("jmp", -(index + offset)) for offset in range(1, skip))
+    program.append(("jmp", -bug))
+    program.extend(("acc", rng.randint(-50, 50)) for _ in range(tail))
+    return "\n".join(f"{op} {value:+d}" for op, value in program)
+
+
+def _xmas(rng: Random, size: int, preamble: int = 25) -> str:
+    """Numbers that are each the sum of two of the previous 25, then one that isn't.
+
+    As in the real puzzle the values grow exponentially with length.
+
+    """
+    data = rng.sample(range(1, 100), preamble)
+    while len(data) < max(size, preamble + 2) - 1:
+        a, b = rng.sample(sorted(data[-preamble:])[:5], 2)
+        data.append(a + b)
+    window = data[-preamble:]
+    while True:
+        start = rng.randrange(0, len(data) - preamble)
+        target = sum(data[start:start + rng.randint(2, 17)])
+        if not any(a + b == target for a, b in combinations(window, 2)):
+            break
+    data.append(target)
+    return "\n".join(map(str, data))
+
+
+def _adapters(rng: Random, size: int) -> str:
+    joltages = list(accumulate(rng.choices((1, 2, 3), weights=(6, 1, 3), k=size)))
+    rng.shuffle(joltages)
+    return "\n".join(map(str, joltages))
+
+
+def _seats(rng: Random, size: int) -> str:
+    return "\n".join(
+        "".join("." if rng.random() < 0.15 else "L" for _ in range(90))
+        for _ in range(size)
+    )
+
+
+def _navigation(rng: Random, size: int) -> str:
+    return "\n".join(
+        rng.choice([
+            f"{rng.choice('NESWF')}{rng.randint(1, 99)}",
+            f"{rng.choice('LR')}{rng.choice((90, 180, 270))}",
+        ])
+        for _ in range(size)
+    )
+
+
+def _bus_schedule(rng: Random, size: int) -> str:
+    buses = [
+        str(rng.randint(7, 997)) if rng.random() < 0.2 else "x"
+        for _ in range(max(size, 1))
+    ]
+    buses[0] = str(rng.randint(7, 997))
+    return f"{rng.randint(100_000, 10_000_000)}\n{','.join(buses)}"
+
+
+def _docking(rng: Random, size: int) -> str:
+    lines = []
+    for index in range(size):
+        if index % 5 == 0:
+            floating = set(rng.sample(range(36), rng.randint(0, 6)))
+            lines.append("mask = " + "".join(
+                "X" if bit in floating else rng.choice("01")
+                for bit in range(36)
+            ))
+        else:
+            lines.append(f"mem[{rng.randint(1, 65535)}] = {rng.randint(1, 1 << 30)}")
+    return "\n".join(lines)
+
+
+def _starting_numbers(rng: Random, size: int) -> str:
+    return ",".join(map(str, rng.sample(range(max(size, 1) * 2), max(size, 1))))
+
+
+def _tickets(rng: Random, size: int, fields: int = 20) -> str:
+    rules = []
+    for index in range(fields):
+        low, high = rng.randint(25, 50), rng.randint(900, 975)
+        gap = rng.randint(low + 100, 800)
+        rules.append(f"{_word(index)} {_word(index + 99)}: {low}-{gap} or {gap + rng.randint(10, 30)}-{high}")
+
+    def ticket() -> str:
+        return ",".join(
+            str(rng.randint(25, 975) if rng.random() < 0.99 else rng.randint(976, 999))
+            for _ in range(fields)
+        )
+
+    return "\n\n".join([
+        "\n".join(rules),
+        f"your ticket:\n{ticket()}",
+        "nearby tickets:\n" + "\n".join(ticket() for _ in range(size)),
+    ])
+
+
+def _cubes(rng: Random, size: int) -> str:
+    return _grid(rng, size, size, 0.5)
+
+
+def _homework(rng: Random, size: int) -> str:
+    def expression(depth: int) -> str:
+        terms = []
+        for _ in range(rng.randint(2, 5)):
+            if depth < 2 and rng.random() < 0.25:
+                terms.append(f"({expression(depth + 1)})")
+            else:
+                terms.append(str(rng.randint(1, 9)))
+        return "".join(
+            term if index == 0 else f" {rng.choice('+*')} {term}"
+            for index, term in enumerate(terms)
+        )
+
+    return "\n".join(expression(0) for _ in range(size))
+
+
+def _messages(rng: Random, size: int, depth: int = 6) -> str:
+    """Binary grammar of fixed depth, with half the messages drawn from it."""
+    rules: dict[int, str] = {}
+    samplers: dict[int, Callable[[], str]] = {}
+
+    def build(index: int, level: int) -> int:
+        if level == depth:
+            rules[index] = f'"{"ab"[index % 2]}"'
+            samplers[index] = lambda: "ab"[index % 2]
+            return index
+        first, second = 2 * index + 1, 2 * index + 2
+        build(first, level + 1)
+        build(second, level + 1)
+        if rng.random() < 0.5:
+            rules[index] = f"{first} {second} | {second} {first}"
+            samplers[index] = lambda: "".join(
+                samplers[i]() for i in rng.choice([(first, second), (second, first)])
+            )
+        else:
+            rules[index] = f"{first} {second}"
+            samplers[index] = lambda: samplers[first]() + samplers[second]()
+        return index
+
+    build(0, 0)
+    length = len(samplers[0]())
+    messages = [
+        samplers[0]() if rng.random() < 0.5 else "".join(rng.choices("ab", k=length))
+        for _ in range(size)
+    ]
+    ordered = list(rules.items())
+    rng.shuffle(ordered)
+    return "\n".join(f"{index}: {rule}" for index, rule in ordered) + "\n\n" + "\n".join(messages)
+
+
+def _tiles(rng: Random, size: int) -> str:
+    """A square grid of tiles with unique edges, each randomly flipped and rotated.
+
+    Neighbouring tiles share their touching border, and borders are made
+    long enough that no other pair of edges is likely to match.
+
+    """
+    side = max(isqrt(size), 2)
+    edge = max(10, 2 * (4 * side * side).bit_length() + 6)
+    step = edge - 1
+    pixels = side * step + 1
+    while True:
+        image = [[rng.random() < 0.5 for _ in range(pixels)] for _ in range(pixels)]
+        grid = [
+            [
+                [line[column * step:column * step + edge] for line in image[row * step:row * step + edge]]
+                for column in range(side)
+            ]
+            for row in range(side)
+        ]
+        borders = Counter(
+            min(border, border[::-1])
+            for row in grid
+            for tile in row
+            for border in (
+                tuple(tile[0]),
+                tuple(tile[-1]),
+                tuple(line[0] for line in tile),
+                tuple(line[-1] for line in tile),
+            )
+        )
+        shared = sum(count == 2 for count in borders.values())
+        if shared == 2 * side * (side - 1) and max(borders.values()) == 2:
+            break
+    ids = rng.sample(range(1000, 1000 + 10 * side * side), side * side)
+    tiles = []
+    for row in range(side):
+        for column in range(side):
+            tile = grid[row][column]
+            for _ in range(rng.randrange(4)):
+                tile = [list(line) for line in zip(*tile[::-1])]
+            if rng.random() < 0.5:
+                tile = [line[::-1] for line in tile]
+            tiles.append(f"Tile {ids[row * side + column]}:\n" + "\n".join(
+                "".join("#" if cell else "." for cell in line) for line in tile
+            ))
+    rng.shuffle(tiles)
+    return "\n\n".join(tiles)
+
+
+def _foods(rng: Random, size: int, allergens: int = 8) -> str:
+    names = [_word(index, 5) for index in range(200)]
+    culprits = dict(zip((_word(index) for index in range(allergens)), rng.sample(names, allergens)))
+    foods = []
+    for _ in range(size):
+        listed = rng.sample(sorted(culprits), rng.randint(1, 3))
+        ingredients = set(rng.sample(names, rng.randint(5, 40)))
+        ingredients.update(culprits[allergen] for allergen in listed)
+        ordered = sorted(ingredients)
+        rng.shuffle(ordered)
+        foods.append(f"{' '.join(ordered)} (contains {', '.join(listed)})")
+    return "\n".join(foods)
+
+
+def _decks(rng: Random, size: int) -> str:
+    cards = list(range(1, 2 * max(size, 1) + 1))
+    rng.shuffle(cards)
+    return "\n\n".join(
+        f"Player {player}:\n" + "\n".join(map(str, deck))
+        for player, deck in ((1, cards[:len(cards) // 2]), (2, cards[len(cards) // 2:]))
+    )
+
+
+def _cups(rng: Random, size: int) -> str:
+    return "".join(rng.sample("123456789", 9))
+
+
+def _tile_paths(rng: Random, size: int) -> str:
+    return "\n".join(
+        "".join(rng.choices(["e", "se", "sw", "w", "nw", "ne"], k=rng.randint(10, 25)))
+        for _ in range(size)
+    )
+
+
+GENERATORS: dict[str, Callable[[Random, int], str]] = dict(
+    day01=_expenses,
+    day02=_passwords,
+    day03=_trees,
+    day04=_passports,
+    day05=_boarding_passes,
+    day06=_customs,
+    day07=_bag_rules,
+    day08=_boot_code,
+    day09=_xmas,
+    day10=_adapters,
+    day11=_seats,
+    day12=_navigation,
+    day13=_bus_schedule,
+    day14=_docking,
+    day15=_starting_numbers,
+    day16=_tickets,
+    day17=_cubes,
+    day18=_homework,
+    day19=_messages,
+    day20=_tiles,
+    day21=_foods,
+    day22=_decks,
+    day23=_cups,
+    day24=_tile_paths,
+)
+
+
+def generate(day: str, size: int, seed: int = SEED) -> str:
+    """Create an input of the given size for the day."""
+    if day not in GENERATORS:
+        raise ValueError(f"no generator for {day}")
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    return GENERATORS[day](Random(f"{day}:{seed}"), size)
+
+
+def write(day: str, size: int, path: str, seed: int = SEED) -> str:
+    with open(path, "w") as f:
+        f.write(generate(day, size, seed))
+        f.write("\n")
+    return path
+
+
+def parse_args(argv: list[str]):
+    parser = ArgumentParser(prog="python3 -m aoc.generators", description=__doc__.split("\n")[0])
+    parser.add_argument("day", choices=sorted(GENERATORS))
+    parser.add_argument("size", type=int, nargs="?", default=1000)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", help="file to write (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> None:
+    options = parse_args(argv)
+    if options.output:
+        write(options.day, options.size, options.output, options.seed)
+    else:
+        print(generate(options.day, options.size, options.seed))
+
+
+class GeneratorTests(TestCase):
+
+    QUICK_DAYS = sorted(set(GENERATORS) - {"day15", "day17", "day22"})
+
+    def test_every_day_has_a_generator(self):
+        self.assertEqual(sorted(DAYS), sorted(GENERATORS))
+
+    def test_deterministic(self):
+        for day in GENERATORS:
+            with self.subTest(day=day):
+                self.assertEqual(generate(day, 20, seed=1), generate(day, 20, seed=1))
+
+    def test_generated_inputs_solve(self):
+        with TemporaryDirectory() as directory:
+            for day in self.QUICK_DAYS:
+                with self.subTest(day=day):
+                    path = write(day, 30, join(directory, f"{day}.txt"))
+                    self.assertIsNotNone(DAYS[day].run(path))
+
+    def test_slow_days_with_small_arguments(self):
+        puzzles = {name: DAYS[name].puzzle for name in ("day15", "day17", "day22")}
+        starting = [int(value) for value in generate("day15", 6).split(",")]
+        self.assertIsInstance(puzzles["day15"](starting, 2020), int)
+        self.assertIsInstance(puzzles["day17"](generate("day17", 4), cycles=2, dimensions=3), int)
+        self.assertIsInstance(puzzles["day22"](generate("day22", 5)), int)
+
+    def test_boot_code_has_one_fix(self):
+        from day08.impl import InfiniteLoop, execute
+        lines = [(op, int(value)) for op, value in map(str.split, generate("day08", 200).split("\n"))]
+        fixes = 0
+        for index, (op, value) in enumerate(lines):
+            if op in ("jmp", "nop"):
+                try:
+                    execute(lines[:index] + [("nop" if op == "jmp" else "jmp", value)] + lines[index + 1:])
+                    fixes += 1
+                except InfiniteLoop:
+                    pass
+        self.assertEqual(1, fixes)
+
+    def test_boarding_passes_scale_beyond_one_plane(self):
+        passes = generate("day05", 5000).split("\n")
+        self.assertEqual(5000, len(passes))
+        self.assertEqual(1, len({len(code) for code in passes}))
+
+    def test_rejects_empty_inputs(self):
+        with self.assertRaises(ValueError):
+            generate("day01", 0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
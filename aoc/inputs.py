@@ -0,0 +1,121 @@
+"""Lazily read puzzle input from a memory-mapped file.
+
+Rather than reading the whole file into a string and splitting it, these
+generators yield one line or one blank-line-separated record at a time,
+so only the current item is held as a Python object. ``chunks`` splits a
+large file into line-aligned byte ranges that workers can map on their own.
+
+"""
+from __future__ import annotations
+
+import mmap
+from os.path import join
+from typing import Iterator
+from unittest import TestCase
+
+from aoc.testing import temporary_directory
+
+
+def _raw_lines(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            return
+        with mapped:
+            start, size = 0, len(mapped)
+            while start < size:
+                end = mapped.find(b"\n", start)
+                if end == -1:
+                    end = size
+                yield mapped[start:end].rstrip(b"\r")
+                start = end + 1
+
+
+def chunks(path: str, size: int) -> list[tuple[int, int]]:
+    """Split the file into byte ranges of at least size bytes, each ending after a line break."""
+    if size < 1:
+        raise ValueError("chunk size must be positive")
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return []
+        with mapped:
+            ranges, start, total = [], 0, len(mapped)
+            while start < total:
+                end = mapped.find(b"\n", min(start + size, total) - 1)
+                end = total if end == -1 else end + 1
+                ranges.append((start, end))
+                start = end
+            return ranges
+
+
+def lines(path: str, encoding: str = "utf-8") -> Iterator[str]:
+    """Yield each line without its line ending, ignoring trailing blank lines."""
+    blank = 0
+    for line in _raw_lines(path):
+        if not line.strip():
+            blank += 1
+            continue
+        for _ in range(blank):
+            yield ""
+        blank = 0
+        yield line.decode(encoding)
+
+
+def records(path: str, encoding: str = "utf-8") -> Iterator[str]:
+    """Yield each group of lines separated by one or more blank lines."""
+    record: list[str] = []
+    for line in lines(path, encoding):
+        if line.strip():
+            record.append(line)
+        elif record:
+            yield "\n".join(record)
+            record = []
+    if record:
+        yield "\n".join(record)
+
+
+class InputsTests(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+
+    def _write(self, content: bytes) -> str:
+        path = join(self.directory, "input.txt")
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_lines(self):
+        path = self._write(b"abc\r\n\ndef\nghi\n\n\n")
+        self.assertEqual(["abc", "", "def", "ghi"], list(lines(path)))
+
+    def test_lines_without_final_newline(self):
+        self.assertEqual(["abc", "def"], list(lines(self._write(b"abc\ndef"))))
+
+    def test_empty_file(self):
+        path = self._write(b"")
+        self.assertEqual([], list(lines(path)))
+        self.assertEqual([], list(records(path)))
+
+    def test_records(self):
+        path = self._write(b"a b\nc\n\nd\n\n\ne f\n")
+        self.assertEqual(["a b\nc", "d", "e f"], list(records(path)))
+
+    def test_is_lazy(self):
+        path = self._write(b"1\n2\n3\n")
+        iterator = lines(path)
+        self.assertEqual("1", next(iterator))
+        self.assertEqual(["2", "3"], list(iterator))
+
+    def test_chunks(self):
+        content = b"one\ntwo\nthree\nfour"
+        path = self._write(content)
+        ranges = chunks(path, 5)
+        self.assertEqual([(0, 8), (8, 14), (14, 18)], ranges)
+        self.assertEqual([b"one\ntwo\n", b"three\n", b"four"], [content[start:end] for start, end in ranges])
+        self.assertEqual([(0, 18)], chunks(path, 100))
+        self.assertEqual([(0, 4), (4, 8), (8, 14), (14, 18)], chunks(path, 1))
+        self.assertEqual([], chunks(self._write(b""), 5))
@@ -0,0 +1,181 @@
+"""Measure peak traced memory, and where it was allocated, with tracemalloc.
+
+``track_memory`` is a context manager usable from tests::
+
+    with track_memory(budget=50 * MiB) as usage:
+        puzzle(...)
+    usage.peak  # bytes above what was allocated on entry
+
+Exceeding the budget raises ``MemoryBudgetExceeded``, an AssertionError so
+unittest reports it as a failure. Allocation sites are taken from
+snapshots made by a watcher thread whenever traced memory has grown by a
+quarter since the last one, so they reflect the allocations close to the
+peak rather than whatever is still alive at the end.
+
+"""
+from __future__ import annotations
+
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Optional
+from unittest import TestCase
+
+from aoc.days import DAYS, Day
+
+KiB = 1024
+MiB = 1024 * KiB
+
+
+class Site(NamedTuple):
+    location: str
+    size: int
+    count: int
+
+
+class MemoryUsage:
+
+    def __init__(self):
+        self.peak = 0
+        self.sites: list[Site] = []
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(peak={self.peak})"
+
+
+class MemoryBudgetExceeded(AssertionError):
+
+    def __init__(self, peak: int, budget: int):
+        super().__init__(f"peak memory {peak / MiB:.1f} MiB exceeds budget {budget / MiB:.1f} MiB")
+        self.peak = peak
+        self.budget = budget
+
+
+class _Watcher:
+    """Snapshot tracemalloc each time traced memory grows by the given factor."""
+
+    def __init__(self, baseline: int, interval: float, growth: float):
+        self.interval = interval
+        self.growth = growth
+        self.threshold = baseline
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> _Watcher:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.check()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if self.snapshot is None or current > self.threshold:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.threshold = max(current, 1) * self.growth
+
+
+def _sites(snapshot: tracemalloc.Snapshot, top: int) -> list[Site]:
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, threading.__file__),
+    ])
+    return [
+        Site(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+
+
+@contextmanager
+def track_memory(
+    *,
+    budget: Optional[int] = None,
+    top: int = 10,
+    interval: float = 0.05,
+    growth: float = 1.25,
+) -> Iterator[MemoryUsage]:
+    """Record the peak traced memory, and its top allocation sites, within the block."""
+    usage = MemoryUsage()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    try:
+        if top:
+            with _Watcher(baseline, interval, growth) as watcher:
+                yield usage
+            usage.sites = _sites(watcher.snapshot, top)
+        else:
+            yield usage
+        usage.peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if started:
+            tracemalloc.stop()
+    if budget is not None and usage.peak > budget:
+        raise MemoryBudgetExceeded(usage.peak, budget)
+
+
+def measure_memory(day: Day, *, path: Optional[str] = None, top: int = 10) -> tuple[object, MemoryUsage]:
+    """Solve the day while tracking memory, excluding loading the arguments."""
+    args, kwargs = day.load(path)
+    puzzle = day.puzzle
+    with track_memory(top=top) as usage:
+        result = puzzle(*args, **kwargs)
+    return result, usage
+
+
+def format_usage(day: str, result: object, usage: MemoryUsage) -> str:
+    lines = [f"{day}: peak {usage.peak / KiB:.0f} KiB, result {result}"]
+    lines.extend(
+        f"  {site.size / KiB:>10.0f} KiB  {site.count:>9} blocks  {site.location}"
+        for site in usage.sites
+    )
+    return "\n".join(lines)
+
+
+class MemoryTests(TestCase):
+
+    def test_peak_excludes_existing_allocations(self):
+        existing = [object() for _ in range(10_000)]
+        with track_memory(top=0) as usage:
+            data = list(range(100_000))
+            del data
+        self.assertGreater(usage.peak, 100_000 * 8)
+        self.assertLess(usage.peak, 10 * MiB)
+        self.assertTrue(existing)
+
+    def test_sites_point_at_allocation(self):
+        with track_memory(top=3) as usage:
+            data = [str(value) for value in range(50_000)]
+        self.assertTrue(any(__file__ in site.location for site in usage.sites))
+        self.assertTrue(data)
+
+    def test_budget(self):
+        with self.assertRaises(MemoryBudgetExceeded):
+            with track_memory(budget=KiB, top=0):
+                data = list(range(10_000))
+        with track_memory(budget=MiB, top=0):
+            data = list(range(10))
+        self.assertTrue(data)
+
+    def test_nested_tracing_is_left_running(self):
+        tracemalloc.start()
+        try:
+            with track_memory(top=0):
+                pass
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+    def test_measure_memory(self):
+        result, usage = measure_memory(DAYS["day13"], top=2)
+        self.assertEqual(DAYS["day13"].run(), result)
+        self.assertGreaterEqual(usage.peak, 0)
@@ -0,0 +1,168 @@
+"""Cache the parsed form of an input next to it, to skip re-parsing.
+
+Days that split their ``puzzle`` into ``parse`` and ``solve`` can have the
+result of ``parse`` pickled to ``<input>.parsed``. The file records the
+input's modification time, size and SHA-256, and the source of the parser
+and of the input reader; an unchanged mtime and size are trusted,
+otherwise the hash decides whether the pickle is still valid. The header is
+pickled on its own ahead of the parsed input, so a stale payload is never
+unpickled, and one that fails to load is treated as a miss.
+
+"""
+from __future__ import annotations
+
+import os
+import pickle
+from hashlib import sha256
+from importlib import import_module
+from os.path import join
+from types import ModuleType
+from typing import Any, Optional
+from unittest import TestCase
+
+from aoc.days import DAYS, Day
+from aoc.results import day_digest
+from aoc.testing import temporary_directory
+
+SUFFIX = ".parsed"
+
+
+def supports(day: Day) -> bool:
+    module = import_module(f"{day.name}.impl")
+    return hasattr(module, "parse") and hasattr(module, "solve")
+
+
+def _module(day: Day) -> ModuleType:
+    if not supports(day):
+        raise ValueError(f"{day.name} has no separate parse and solve stages")
+    return import_module(f"{day.name}.impl")
+
+
+def _file_digest(path: str) -> str:
+    digest = sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_parsed(day: Day, path: Optional[str] = None) -> Any:
+    """Get the parsed input, from the cache file if it is still valid."""
+    module = _module(day)
+    path = path or day.input_path
+    stat = os.stat(path)
+    source = day_digest(day)
+    cache_path = path + SUFFIX
+    header, parsed = _load(cache_path, day, source)
+    if header is not None:
+        if (header["mtime"], header["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return parsed
+        digest = _file_digest(path)
+        if header["sha256"] == digest:
+            _save(cache_path, dict(header, mtime=stat.st_mtime_ns, size=stat.st_size), parsed)
+            return parsed
+    else:
+        digest = _file_digest(path)
+    parsed = module.parse(*day.read(path))
+    _save(cache_path, dict(
+        day=day.name,
+        source=source,
+        mtime=stat.st_mtime_ns,
+        size=stat.st_size,
+        sha256=digest,
+    ), parsed)
+    return parsed
+
+
+def _load(cache_path: str, day: Day, source: str) -> tuple[Optional[dict[str, Any]], Any]:
+    """Read the header, and the parsed input only if the header is for this day and source."""
+    try:
+        with open(cache_path, "rb") as f:
+            header = pickle.load(f)
+            if not isinstance(header, dict) or header.get("day") != day.name or header.get("source") != source:
+                return None, None
+            return header, pickle.load(f)
+    except FileNotFoundError:
+        return None, None
+    except Exception:
+        # A payload can refer to classes that have since been renamed or moved.
+        return None, None
+
+
+def _save(cache_path: str, header: dict[str, Any], parsed: Any) -> None:
+    partial = f"{cache_path}.{os.getpid()}.tmp"
+    with open(partial, "wb") as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(partial, cache_path)
+
+
+def solve(day: Day, parsed: Any) -> Any:
+    """Run only the solve stage with the day's fixed arguments."""
+    return _module(day).solve(parsed, *day.args, **(day.kwargs or {}))
+
+
+class ParsedTests(TestCase):
+
+    example = "\n".join([
+        "shiny gold bags contain 2 dark red bags.",
+        "dark red bags contain 2 dark orange bags.",
+        "dark orange bags contain no other bags.",
+    ])
+
+    def setUp(self):
+        self.path = join(temporary_directory(self), "input.txt")
+        self._write(self.example)
+        self.day = DAYS["day07"]
+
+    def _write(self, content: str, mtime_ns: Optional[int] = None) -> None:
+        with open(self.path, "w") as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def _cached(self) -> Any:
+        with open(self.path + SUFFIX, "rb") as f:
+            return pickle.load(f), pickle.load(f)
+
+    def _rewrite(self, header: dict[str, Any], payload: bytes) -> None:
+        with open(self.path + SUFFIX, "wb") as f:
+            pickle.dump(header, f)
+            f.write(payload)
+
+    def test_supports(self):
+        self.assertTrue(supports(DAYS["day07"]))
+        self.assertFalse(supports(DAYS["day13"]))
+
+    def test_parses_then_reuses(self):
+        parsed = load_parsed(self.day, self.path)
+        self.assertEqual(6, solve(self.day, parsed))
+        header, cached = self._cached()
+        self.assertEqual(parsed, cached)
+        self._rewrite(header, pickle.dumps("sentinel"))
+        self.assertEqual("sentinel", load_parsed(self.day, self.path))
+
+    def test_touched_but_unchanged_input_is_reused(self):
+        load_parsed(self.day, self.path)
+        header, _ = self._cached()
+        self._rewrite(header, pickle.dumps("sentinel"))
+        self._write(self.example, mtime_ns=header["mtime"] + 10 ** 9)
+        self.assertEqual("sentinel", load_parsed(self.day, self.path))
+
+    def test_changed_input_is_reparsed(self):
+        load_parsed(self.day, self.path)
+        header, _ = self._cached()
+        self._write(self.example.replace("2 dark orange", "3 dark orange"), mtime_ns=header["mtime"] + 10 ** 9)
+        self.assertEqual(8, solve(self.day, load_parsed(self.day, self.path)))
+
+    def test_unloadable_payload_is_reparsed(self):
+        load_parsed(self.day, self.path)
+        header, _ = self._cached()
+        for payload in (b"cday07.impl\nRenamedGraph\n.", b"not a pickle"):
+            with self.subTest(payload=payload):
+                self._rewrite(header, payload)
+                self.assertEqual(6, solve(self.day, load_parsed(self.day, self.path)))
+
+    def test_unsupported_day(self):
+        with self.assertRaises(ValueError):
+            load_parsed(DAYS["day13"], self.path)
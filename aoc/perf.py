@@ -0,0 +1,92 @@
+"""Opt-in performance regression tests.
+
+Skipped unless ``AOC_PERF`` is set:
+
+- ``AOC_PERF=record python3 -m unittest aoc/perf.py`` saves baseline timings;
+- ``AOC_PERF=check python3 -m unittest aoc/perf.py`` fails any day whose
+  fastest run is slower than its baseline by more than the allowed ratio,
+  and records a baseline for days that don't have one yet.
+
+``AOC_PERF_DAYS`` (comma-separated), ``AOC_PERF_RATIO`` (default 1.5),
+``AOC_PERF_REPEAT`` (default 5) and ``AOC_PERF_BASELINE`` (default
+``perf_baseline.json`` in the repository root) tune the run. Comparing the
+fastest of several runs, with an absolute slack for very quick days,
+keeps the check stable on noisy shared runners.
+
+"""
+from __future__ import annotations
+
+import json
+import os
+from os.path import join
+from tempfile import TemporaryDirectory
+from typing import Optional
+from unittest import TestCase, skipUnless
+
+from aoc.days import ROOT, discover
+from aoc.runner import measure
+
+MODE = os.environ.get("AOC_PERF", "").lower()
+BASELINE_PATH = os.environ.get("AOC_PERF_BASELINE", join(ROOT, "perf_baseline.json"))
+RATIO = float(os.environ.get("AOC_PERF_RATIO", "1.5"))
+REPEAT = int(os.environ.get("AOC_PERF_REPEAT", "5"))
+SLACK = 0.005
+
+
+def regression(current: float, baseline: float, ratio: float = RATIO, slack: float = SLACK) -> Optional[str]:
+    """Describe the regression, if current is too slow compared to baseline."""
+    allowed = baseline * ratio + slack
+    if current > allowed:
+        return f"{current:.4f}s exceeds baseline {baseline:.4f}s x {ratio} (+{slack}s slack)"
+    return None
+
+
+def load_baseline(path: str = BASELINE_PATH) -> dict[str, float]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(baseline: dict[str, float], path: str = BASELINE_PATH) -> None:
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+@skipUnless(MODE in ("record", "check"), "set AOC_PERF=record or AOC_PERF=check to run")
+class PerformanceTests(TestCase):
+
+    def test_no_regressions(self):
+        names = os.environ.get("AOC_PERF_DAYS")
+        baseline = load_baseline()
+        for day in discover(names.split(",") if names else None):
+            with self.subTest(day=day.name):
+                fastest = min(measure(day, repeat=REPEAT, warmup=1).wall)
+                if MODE == "check" and day.name in baseline:
+                    problem = regression(fastest, baseline[day.name])
+                    if problem:
+                        self.fail(f"{day.name} regressed: {problem}")
+                else:
+                    baseline[day.name] = fastest
+        save_baseline(baseline)
+
+
+class RegressionTests(TestCase):
+
+    def test_within_ratio(self):
+        self.assertIsNone(regression(1.4, 1.0, ratio=1.5))
+
+    def test_beyond_ratio(self):
+        self.assertIn("exceeds baseline", regression(1.6, 1.0, ratio=1.5))
+
+    def test_slack_absorbs_noise_on_quick_days(self):
+        self.assertIsNone(regression(0.004, 0.001, ratio=1.5, slack=0.005))
+
+    def test_baseline_round_trip(self):
+        with TemporaryDirectory() as directory:
+            path = join(directory, "baseline.json")
+            self.assertEqual({}, load_baseline(path))
+            save_baseline(dict(day01=0.5), path)
+            self.assertEqual(dict(day01=0.5), load_baseline(path))
@@ -0,0 +1,140 @@
+"""Profile a single day's puzzle and report its hottest functions.
+
+By default the call runs under cProfile. For long runs, such as day 15's
+30,000,000 turns, a sampling interval can be given instead: a background
+thread then records the main thread's stack every interval, which costs
+almost nothing per call. Either way a ``.pstats`` file is written, and the
+report can be limited to functions matching a regular expression.
+
+"""
+from __future__ import annotations
+
+import cProfile
+import marshal
+import pstats
+import sys
+import threading
+from collections import Counter
+from io import StringIO
+from os.path import join
+from types import FrameType
+from typing import Optional
+from unittest import TestCase
+
+from aoc.days import DAYS, Day
+from aoc.testing import temporary_directory
+
+FunctionKey = tuple[str, int, str]
+
+
+class Sampler:
+    """Statistical profiler sampling one thread's stack at a fixed interval."""
+
+    def __init__(self, interval: float, thread_id: Optional[int] = None):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.own = Counter()
+        self.cumulative = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> Sampler:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._record(frame)
+
+    def _record(self, frame: FrameType) -> None:
+        self.samples += 1
+        self.own[_key(frame)] += 1
+        seen = set()
+        while frame is not None:
+            key = _key(frame)
+            if key not in seen:
+                seen.add(key)
+                self.cumulative[key] += 1
+            frame = frame.f_back
+
+    def dump_stats(self, path: str) -> None:
+        """Write the samples in the marshalled format pstats reads."""
+        stats = {
+            key: (count, count, self.own[key] * self.interval, count * self.interval, {})
+            for key, count in self.cumulative.items()
+        }
+        with open(path, "wb") as f:
+            marshal.dump(stats, f)
+
+
+def _key(frame: FrameType) -> FunctionKey:
+    code = frame.f_code
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def profile(
+    day: Day,
+    output: str,
+    *,
+    path: Optional[str] = None,
+    top: int = 20,
+    interval: Optional[float] = None,
+    allow: Optional[str] = None,
+    sort: str = "tottime",
+) -> str:
+    """Profile one puzzle call, write the stats to output and return a report."""
+    args, kwargs = day.load(path)
+    puzzle = day.puzzle
+    if interval is None:
+        profiler = cProfile.Profile()
+        profiler.runcall(puzzle, *args, **kwargs)
+        profiler.dump_stats(output)
+    else:
+        with Sampler(interval) as sampler:
+            puzzle(*args, **kwargs)
+        sampler.dump_stats(output)
+    report = StringIO()
+    stats = pstats.Stats(output, stream=report)
+    restrictions = [allow] if allow else []
+    stats.strip_dirs().sort_stats(sort).print_stats(*restrictions, top)
+    return report.getvalue()
+
+
+class ProfilingTests(TestCase):
+
+    def setUp(self):
+        self.output = join(temporary_directory(self), "day.pstats")
+
+    def test_cprofile_reports_hot_functions(self):
+        report = profile(DAYS["day08"], self.output, top=5)
+        self.assertIn("terminating", report)
+        self.assertGreater(pstats.Stats(self.output).total_calls, 0)
+
+    def test_allow_restricts_report(self):
+        report = profile(DAYS["day08"], self.output, allow="repair")
+        self.assertIn("repair", report)
+        self.assertNotIn("terminating", report)
+
+    def test_sampler_records_busy_function(self):
+        def busy():
+            return sum(range(3_000_000))
+
+        with Sampler(0.001) as sampler:
+            busy()
+        sampler.dump_stats(self.output)
+        self.assertGreater(sampler.samples, 0)
+        self.assertIn("busy", {name for _, _, name in sampler.cumulative})
+        self.assertGreater(len(pstats.Stats(self.output).stats), 0)
+
+    def test_sampler_rejects_bad_interval(self):
+        with self.assertRaises(ValueError):
+            Sampler(0)
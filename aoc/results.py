@@ -0,0 +1,162 @@
+"""On-disk cache of puzzle results, keyed by content.
+
+The key hashes the input file's bytes, the fixed arguments, and the source
+of the day's ``impl.py`` and of the module defining its input reader, along
+with any ``aoc`` modules they import, so editing the solver, the way its
+input is read or the input itself invalidates the entry. Looking up a result
+reads files but never imports the day's module.
+
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from hashlib import sha256
+from inspect import getsourcefile
+from os.path import isfile, join
+from typing import Any, Optional
+from unittest import TestCase
+
+from aoc.days import DAYS, ROOT, Day
+from aoc.testing import temporary_directory
+
+CACHE_DIR = join(ROOT, ".cache", "results")
+AOC_IMPORT = re.compile(rb"^(?:(?:from|import) aoc\.(\w+)|from aoc import \(?([\w ,\t]+))", re.MULTILINE)
+
+_MISSING = object()
+
+
+def _imported_modules(source: bytes) -> list[str]:
+    modules = set()
+    for dotted, listed in AOC_IMPORT.findall(source):
+        if dotted:
+            modules.add(dotted.decode())
+        else:
+            modules.update(name.split()[0] for name in listed.decode().split(",") if name.strip())
+    return sorted(modules)
+
+
+def source_digest(*paths: str) -> bytes:
+    """Hash modules' sources together with the aoc modules they import."""
+    digest = sha256()
+    pending, seen = list(reversed(paths)), set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        with open(current, "rb") as f:
+            source = f.read()
+        digest.update(source)
+        pending.extend(
+            path
+            for path in (join(ROOT, "aoc", f"{module}.py") for module in _imported_modules(source))
+            if isfile(path)
+        )
+    return digest.digest()
+
+
+def day_digest(day: Day) -> bytes:
+    """Hash the day's solver and the module that reads its input."""
+    return source_digest(day.source_path, getsourcefile(day.read))
+
+
+def cache_key(day: Day, path: Optional[str] = None) -> str:
+    digest = sha256()
+    with open(path or day.input_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    digest.update(repr((day.name, day.args, sorted((day.kwargs or {}).items()))).encode())
+    digest.update(day_digest(day))
+    return digest.hexdigest()
+
+
+def lookup(day: Day, path: Optional[str] = None, directory: str = CACHE_DIR, default: Any = None) -> Any:
+    try:
+        with open(join(directory, f"{cache_key(day, path)}.json")) as f:
+            return json.load(f)["result"]
+    except FileNotFoundError:
+        return default
+
+
+def store(day: Day, result: Any, path: Optional[str] = None, directory: str = CACHE_DIR) -> None:
+    os.makedirs(directory, exist_ok=True)
+    target = join(directory, f"{cache_key(day, path)}.json")
+    partial = f"{target}.{os.getpid()}.tmp"
+    with open(partial, "w") as f:
+        json.dump(dict(day=day.name, result=result), f)
+    os.replace(partial, target)
+
+
+def cached_run(day: Day, path: Optional[str] = None, directory: str = CACHE_DIR) -> Any:
+    """Return the cached result if there is one, otherwise solve and cache it."""
+    result = lookup(day, path, directory, _MISSING)
+    if result is _MISSING:
+        result = day.run(path)
+        store(day, result, path, directory)
+    return result
+
+
+class ResultsTests(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.input_path = join(self.directory, "input.txt")
+        with open(self.input_path, "w") as f:
+            f.write("939\n7,13,x,x,59,x,31,19\n")
+
+    def test_miss_then_hit(self):
+        day = DAYS["day13"]
+        self.assertIsNone(lookup(day, self.input_path, self.directory))
+        self.assertEqual(295, cached_run(day, self.input_path, self.directory))
+        self.assertEqual(295, lookup(day, self.input_path, self.directory))
+
+    def test_hit_does_not_solve(self):
+        day = DAYS["day13"]
+        store(day, "sentinel", self.input_path, self.directory)
+        self.assertEqual("sentinel", cached_run(day, self.input_path, self.directory))
+
+    def test_key_depends_on_input_and_arguments(self):
+        day = DAYS["day13"]
+        key = cache_key(day, self.input_path)
+        self.assertNotEqual(key, cache_key(day._replace(args=(1,)), self.input_path))
+        with open(self.input_path, "a") as f:
+            f.write("\n")
+        self.assertNotEqual(key, cache_key(day, self.input_path))
+
+    def test_source_digest_includes_imported_aoc_modules(self):
+        module = join(self.directory, "impl.py")
+        with open(module, "w") as f:
+            f.write("x = 1\n")
+        without = source_digest(module)
+        with open(module, "w") as f:
+            f.write("x = 1\nfrom aoc.cache import memoize\n")
+        with open(join(ROOT, "aoc", "cache.py"), "rb") as f:
+            cache_source = f.read()
+        expected = sha256(b"x = 1\nfrom aoc.cache import memoize\n" + cache_source).digest()
+        self.assertNotEqual(without, source_digest(module))
+        self.assertEqual(expected, source_digest(module))
+
+    def test_source_digest_follows_from_aoc_imports(self):
+        module = join(self.directory, "impl.py")
+        with open(module, "w") as f:
+            f.write("from aoc import inputs, cache as memo\n")
+        with open(join(ROOT, "aoc", "inputs.py"), "rb") as f:
+            inputs_source = f.read()
+        with open(join(ROOT, "aoc", "testing.py"), "rb") as f:
+            testing_source = f.read()
+        with open(join(ROOT, "aoc", "cache.py"), "rb") as f:
+            cache_source = f.read()
+        expected = sha256(
+            b"from aoc import inputs, cache as memo\n" + inputs_source + testing_source + cache_source
+        ).digest()
+        self.assertEqual(expected, source_digest(module))
+
+    def test_key_depends_on_reader(self):
+        day = DAYS["day13"]
+        self.assertNotEqual(
+            day_digest(day),
+            source_digest(day.source_path),
+        )
+        self.assertEqual(day_digest(day), source_digest(day.source_path, join(ROOT, "aoc", "days.py")))
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""Run and time every day's puzzle on its input.
+
+Usage: ``python3 -m aoc.runner [day ...] [--repeat N] [--warmup N] [--jobs N] [--cache] [--solve-only] [--json]``
+or ``python3 -m aoc.runner day --profile [--top N] [--sample-interval S] [--profile-filter REGEX]``
+or ``python3 -m aoc.runner [day ...] --memory [--top N] [--json]``
+
+With ``--jobs`` the days are spread over a process pool, longest first
+according to the timings recorded by previous runs. With ``--cache``
+results already in the on-disk result cache are reported without solving.
+With ``--solve-only`` days that have separate parse and solve stages load
+their parsed input from ``input.txt.parsed`` and only solving is timed.
+With ``--profile`` a single day is run under cProfile, or sampled every
+``--sample-interval`` seconds, writing ``<day>.pstats`` and printing the
+top functions. With ``--memory`` each day is run once under tracemalloc to
+report its peak traced memory and top allocation sites.
+
+"""
+from __future__ import annotations
+
+import json
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import import_module
+from os.path import join
+from statistics import mean
+from tempfile import TemporaryDirectory
+from time import perf_counter, process_time
+from typing import Any, Iterator, NamedTuple, Optional
+from unittest import TestCase
+
+from aoc import memory, parsed, profiling, results
+from aoc.days import DAYS, ROOT, Day, discover
+
+HISTORY_PATH = join(ROOT, ".timings.json")
+
+_MISSING = object()
+
+
+class Timing(NamedTuple):
+    day: str
+    result: Any
+    wall: list[float]
+    cpu: list[float]
+    cached: bool = False
+
+    @property
+    def iterations(self) -> int:
+        return 0 if self.cached else len(self.wall)
+
+    def summary(self) -> dict[str, Any]:
+        return dict(
+            day=self.day,
+            result=self.result,
+            cached=self.cached,
+            iterations=self.iterations,
+            wall_min=min(self.wall),
+            wall_mean=mean(self.wall),
+            cpu_mean=mean(self.cpu),
+        )
+
+
+def measure(
+    day: Day,
+    *,
+    repeat: int = 1,
+    warmup: int = 0,
+    path: Optional[str] = None,
+    solve_only: bool = False,
+) -> Timing:
+    """Time repeated puzzle calls, excluding input loading.
+
+    Streamed input is read in full before the timer starts, so days that
+    take an iterator are timed without their I/O too. With solve_only the
+    parsed input comes from the parsed-input cache and only the day's solve
+    stage is timed.
+
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    puzzle = import_module(f"{day.name}.impl").solve if solve_only else day.puzzle
+    wall, cpu = [], []
+    for iteration in range(warmup + repeat):
+        if solve_only:
+            args, kwargs = (parsed.load_parsed(day, path), *day.args), dict(day.kwargs or {})
+        else:
+            args, kwargs = day.load(path, eager=True)
+        wall_start, cpu_start = perf_counter(), process_time()
+        result = puzzle(*args, **kwargs)
+        wall_end, cpu_end = perf_counter(), process_time()
+        if iteration >= warmup:
+            wall.append(wall_end - wall_start)
+            cpu.append(cpu_end - cpu_start)
+    return Timing(day.name, result, wall, cpu)
+
+
+def measure_cached(day: Day) -> Optional[Timing]:
+    """Time looking up the day's result in the result cache, if it's there."""
+    wall_start, cpu_start = perf_counter(), process_time()
+    result = results.lookup(day, default=_MISSING)
+    if result is _MISSING:
+        return None
+    return Timing(day.name, result, [perf_counter() - wall_start], [process_time() - cpu_start], cached=True)
+
+
+def _measure_by_name(name: str, repeat: int, warmup: int, solve_only: bool) -> Timing:
+    return measure(DAYS[name], repeat=repeat, warmup=warmup, solve_only=solve_only)
+
+
+def longest_first(days: list[Day], history: dict[str, float]) -> list[Day]:
+    """Order days by previous wall time, descending; unseen days go first."""
+    return sorted(days, key=lambda day: -history.get(day.name, float("inf")))
+
+
+def measure_parallel(
+    days: list[Day],
+    *,
+    jobs: Optional[int] = None,
+    repeat: int = 1,
+    warmup: int = 0,
+    history: Optional[dict[str, float]] = None,
+    solve_only: bool = False,
+) -> Iterator[Timing]:
+    """Time the days in worker processes, yielding timings as they finish."""
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(_measure_by_name, day.name, repeat, warmup, solve_only)
+            for day in longest_first(days, history or {})
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def load_history(path: str = HISTORY_PATH) -> dict[str, float]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_history(timings: list[Timing], path: str = HISTORY_PATH) -> None:
+    history = load_history(path)
+    history.update({timing.day: mean(timing.wall) for timing in timings if not timing.cached})
+    with open(path, "w") as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+
+
+def format_table(timings: list[Timing]) -> str:
+    rows = [("day", "iterations", "wall min", "wall mean", "cpu mean", "result")]
+    for timing in timings:
+        summary = timing.summary()
+        rows.append((
+            timing.day,
+            "cached" if timing.cached else str(timing.iterations),
+            f"{summary['wall_min']:.4f}s",
+            f"{summary['wall_mean']:.4f}s",
+            f"{summary['cpu_mean']:.4f}s",
+            str(timing.result),
+        ))
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in rows
+    )
+
+
+def parse_args(argv: list[str]):
+    parser = ArgumentParser(prog="python3 -m aoc.runner", description=__doc__.split("\n")[0])
+    parser.add_argument("days", nargs="*", metavar="day", help="e.g. day07 (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per day")
+    parser.add_argument("--warmup", type=int, default=0, help="untimed runs before timing")
+    parser.add_argument("--jobs", type=int, nargs="?", const=0, help="run days in N processes (default: CPU count)")
+    parser.add_argument("--cache", action="store_true", help="reuse and store results in the result cache")
+    parser.add_argument("--solve-only", action="store_true", help="time only the solve stage, on cached parsed input")
+    parser.add_argument("--json", action="store_true", help="emit one JSON object per day")
+    parser.add_argument("--top", type=int, default=20, help="number of functions or allocation sites to report")
+    parser.add_argument("--memory", action="store_true", help="report peak memory instead of timing")
+    profiling = parser.add_argument_group("profiling")
+    profiling.add_argument("--profile", action="store_true", help="profile a single day instead of timing")
+    profiling.add_argument("--profile-output", help="stats file to write (default: <day>.pstats)")
+    profiling.add_argument("--sample-interval", type=float, help="sample the stack every S seconds instead of tracing")
+    profiling.add_argument("--profile-filter", metavar="REGEX", help="only report matching functions")
+    options = parser.parse_args(argv)
+    if options.profile and len(options.days) != 1:
+        parser.error("--profile needs exactly one day")
+    return options
+
+
+def main(argv: list[str]) -> None:
+    options = parse_args(argv)
+    days = discover(options.days)
+    if options.profile:
+        day, = days
+        print(profiling.profile(
+            day,
+            options.profile_output or f"{day.name}.pstats",
+            top=options.top,
+            interval=options.sample_interval,
+            allow=options.profile_filter,
+        ))
+        return
+    if options.memory:
+        for day in days:
+            result, usage = memory.measure_memory(day, top=options.top)
+            if options.json:
+                print(json.dumps(dict(
+                    day=day.name,
+                    result=result,
+                    peak_bytes=usage.peak,
+                    sites=[site._asdict() for site in usage.sites],
+                )), flush=True)
+            else:
+                print(memory.format_usage(day.name, result, usage), flush=True)
+        return
+    if options.solve_only:
+        unsupported = [day.name for day in days if not parsed.supports(day)]
+        if unsupported:
+            print(f"skipping days without separate parse/solve: {', '.join(unsupported)}", file=sys.stderr)
+        days = [day for day in days if day.name not in unsupported]
+    start = perf_counter()
+    timings = []
+    if options.cache:
+        hits = [timing for timing in map(measure_cached, days) if timing is not None]
+        timings.extend(hits)
+        cached = {timing.day for timing in hits}
+        days = [day for day in days if day.name not in cached]
+    if options.json:
+        for timing in timings:
+            print(json.dumps(timing.summary()), flush=True)
+    if options.jobs is None:
+        pending = (
+            measure(day, repeat=options.repeat, warmup=options.warmup, solve_only=options.solve_only)
+            for day in days
+        )
+    else:
+        pending = measure_parallel(
+            days,
+            jobs=options.jobs or None,
+            repeat=options.repeat,
+            warmup=options.warmup,
+            history=load_history(),
+            solve_only=options.solve_only,
+        )
+    for timing in pending:
+        timings.append(timing)
+        if options.cache:
+            results.store(DAYS[timing.day], timing.result)
+        if options.json:
+            print(json.dumps(timing.summary()), flush=True)
+    elapsed = perf_counter() - start
+    if not options.solve_only:
+        save_history(timings)
+    if not options.json:
+        print(format_table(sorted(timings, key=lambda timing: timing.day)))
+        print(f"total wall: {sum(sum(timing.wall) for timing in timings):.4f}s, elapsed: {elapsed:.4f}s")
+
+
+class RunnerTests(TestCase):
+
+    def test_measure_counts_only_timed_iterations(self):
+        timing = measure(DAYS["day13"], repeat=3, warmup=2)
+        self.assertEqual(3, timing.iterations)
+        self.assertEqual(3, len(timing.cpu))
+
+    def test_measure_returns_puzzle_result(self):
+        self.assertEqual(DAYS["day13"].run(), measure(DAYS["day13"]).result)
+
+    def test_measure_solve_only(self):
+        day = DAYS["day07"]
+        with TemporaryDirectory() as directory:
+            path = join(directory, "input.txt")
+            with open(day.input_path) as source, open(path, "w") as target:
+                target.write(source.read())
+            self.assertEqual(day.run(path), measure(day, path=path, solve_only=True, repeat=2).result)
+
+    def test_measure_rejects_no_repeats(self):
+        with self.assertRaises(ValueError):
+            measure(DAYS["day13"], repeat=0)
+
+    def test_longest_first(self):
+        days = [DAYS["day01"], DAYS["day02"], DAYS["day03"]]
+        ordered = longest_first(days, dict(day01=1.0, day03=2.0))
+        self.assertEqual(["day02", "day03", "day01"], [day.name for day in ordered])
+
+    def test_measure_parallel_matches_serial(self):
+        days = [DAYS["day02"], DAYS["day13"]]
+        timings = {timing.day: timing for timing in measure_parallel(days, jobs=2)}
+        self.assertEqual({day.name: day.run() for day in days}, {
+            name: timing.result for name, timing in timings.items()
+        })
+
+    def test_history_round_trip(self):
+        with TemporaryDirectory() as directory:
+            path = join(directory, "timings.json")
+            self.assertEqual({}, load_history(path))
+            save_history([Timing("day01", 0, [1.0, 3.0], [1.0, 1.0])], path)
+            save_history([Timing("day02", 0, [0.5], [0.5])], path)
+            self.assertEqual(dict(day01=2.0, day02=0.5), load_history(path))
+
+    def test_cached_timing_is_not_saved_to_history(self):
+        with TemporaryDirectory() as directory:
+            path = join(directory, "timings.json")
+            save_history([Timing("day01", 0, [0.1], [0.1], cached=True)], path)
+            self.assertEqual({}, load_history(path))
+
+    def test_format_table(self):
+        table = format_table([Timing("day01", 42, [1.0, 3.0], [0.5, 0.5])])
+        self.assertIn("day01  2", table)
+        self.assertTrue(table.split("\n")[1].endswith("42"))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
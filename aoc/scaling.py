@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Fit how each day's running time grows with the size of its input.
+
+Usage: ``python3 -m aoc.scaling [day ...] [--sizes N ...] [--repeat N] [--threshold K] [--json]``
+
+Each day is run on generated inputs over a geometric series of sizes and
+the exponent k in time ~ n^k is fitted by least squares on the log-log
+timings. Days whose exponent exceeds the threshold are flagged.
+
+"""
+from __future__ import annotations
+
+import json
+import sys
+from argparse import ArgumentParser
+from math import log
+from os.path import join
+from tempfile import TemporaryDirectory
+from typing import Callable, NamedTuple, Optional
+from unittest import TestCase
+
+from aoc.days import DAYS, Day, discover
+from aoc.generators import write
+from aoc.memory import measure_memory
+from aoc.runner import measure
+
+THRESHOLD = 1.2
+
+
+def _identity(size: int) -> int:
+    return size
+
+
+def _fixed(size: int) -> Callable[[int], int]:
+    return lambda _: size
+
+
+class Scale(NamedTuple):
+    """How to build an input (and any size-dependent arguments) for each size."""
+    sizes: tuple[int, ...]
+    input_size: Callable[[int], int] = _identity
+    arguments: Optional[Callable[[int], tuple]] = None
+
+    def day_for(self, day: Day, size: int) -> Day:
+        return day if self.arguments is None else day._replace(args=self.arguments(size))
+
+
+def _series(start: int, steps: int = 5, factor: int = 2) -> tuple[int, ...]:
+    return tuple(start * factor ** step for step in range(steps))
+
+
+SCALES: dict[str, Scale] = dict(
+    day01=Scale(_series(1000)),
+    day02=Scale(_series(2000)),
+    day03=Scale(_series(1000)),
+    day04=Scale(_series(500)),
+    day05=Scale(_series(500)),
+    day06=Scale(_series(1000)),
+    day07=Scale(_series(500)),
+    day08=Scale(_series(1000)),
+    day09=Scale(_series(1000)),
+    day10=Scale(_series(1000)),
+    day11=Scale(_series(10, 4)),
+    day12=Scale(_series(1000)),
+    day13=Scale(_series(1000)),
+    day14=Scale(_series(200)),
+    day15=Scale(_series(20_000), input_size=_fixed(6), arguments=lambda size: (size,)),
+    day16=Scale(_series(500)),
+    day17=Scale((2, 3, 4, 5)),
+    day18=Scale(_series(500)),
+    day19=Scale(_series(250)),
+    day20=Scale(_series(16, 4, 4)),
+    day21=Scale(_series(250)),
+    day22=Scale((4, 8, 12, 16)),
+    # the cups are single digits, so day 23 scales with the number of moves
+    day23=Scale(_series(100, 4, 10), input_size=_fixed(9), arguments=lambda size: (size,)),
+    day24=Scale(_series(5, 4), input_size=_fixed(400), arguments=lambda size: (size,)),
+)
+
+
+class Scaling(NamedTuple):
+    day: str
+    sizes: list[int]
+    times: list[float]
+    peaks: list[int]
+
+    @property
+    def exponent(self) -> float:
+        return fit_exponent(self.sizes, self.times)
+
+    def summary(self, threshold: float = THRESHOLD) -> dict:
+        return dict(
+            day=self.day,
+            sizes=self.sizes,
+            times=self.times,
+            peak_bytes=self.peaks,
+            exponent=round(self.exponent, 3),
+            super_linear=self.exponent > threshold,
+        )
+
+
+def fit_exponent(sizes: list[int], times: list[float]) -> float:
+    """Least-squares slope of log(time) against log(size)."""
+    if len(sizes) < 2:
+        raise ValueError("need at least two sizes to fit an exponent")
+    xs = [log(size) for size in sizes]
+    ys = [log(max(time, 1e-9)) for time in times]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    return (
+        sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+        / sum((x - mean_x) ** 2 for x in xs)
+    )
+
+
+def scale(day: Day, sizes: Optional[list[int]] = None, *, repeat: int = 1) -> Scaling:
+    spec = SCALES[day.name]
+    sizes = list(sizes or spec.sizes)
+    times, peaks = [], []
+    with TemporaryDirectory() as directory:
+        for size in sizes:
+            path = write(day.name, spec.input_size(size), join(directory, f"{size}.txt"))
+            sized = spec.day_for(day, size)
+            times.append(min(measure(sized, repeat=repeat, path=path).wall))
+            peaks.append(measure_memory(sized, path=path, top=0)[1].peak)
+    return Scaling(day.name, sizes, times, peaks)
+
+
+def format_report(results: list[Scaling], threshold: float = THRESHOLD) -> str:
+    lines = []
+    for result in results:
+        flag = "  SUPER-LINEAR" if result.exponent > threshold else ""
+        lines.append(f"{result.day}: n^{result.exponent:.2f}, peak {max(result.peaks) / 1024:.0f} KiB{flag}")
+        lines.extend(
+            f"  n={size:<10} {time:.4f}s  {peak / 1024:.0f} KiB"
+            for size, time, peak in zip(result.sizes, result.times, result.peaks)
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str]):
+    parser = ArgumentParser(prog="python3 -m aoc.scaling", description=__doc__.split("\n")[0])
+    parser.add_argument("days", nargs="*", metavar="day", help="e.g. day09 (default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", help="override each day's default sizes")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per size, fastest is kept")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="exponent flagged as super-linear")
+    parser.add_argument("--json", action="store_true", help="emit one JSON object per day")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> None:
+    options = parse_args(argv)
+    for day in discover(options.days):
+        try:
+            result = scale(day, options.sizes, repeat=options.repeat)
+        except (RecursionError, MemoryError) as error:
+            print(f"{day.name}: failed with {type(error).__name__}", file=sys.stderr, flush=True)
+            continue
+        if options.json:
+            print(json.dumps(result.summary(options.threshold)), flush=True)
+        else:
+            print(format_report([result], options.threshold), flush=True)
+
+
+class ScalingTests(TestCase):
+
+    def test_every_day_has_a_scale(self):
+        self.assertEqual(sorted(DAYS), sorted(SCALES))
+
+    def test_fit_exponent(self):
+        sizes = [10, 20, 40, 80]
+        self.assertAlmostEqual(1.0, fit_exponent(sizes, [size * 0.01 for size in sizes]))
+        self.assertAlmostEqual(3.0, fit_exponent(sizes, [size ** 3 * 1e-6 for size in sizes]))
+
+    def test_fit_exponent_needs_two_sizes(self):
+        with self.assertRaises(ValueError):
+            fit_exponent([10], [1.0])
+
+    def test_scale(self):
+        result = scale(DAYS["day02"], [100, 200])
+        self.assertEqual([100, 200], result.sizes)
+        self.assertEqual(2, len(result.times))
+        self.assertTrue(all(peak > 0 for peak in result.peaks))
+        self.assertIn("exponent", result.summary())
+
+    def test_size_dependent_arguments(self):
+        result = scale(DAYS["day23"], [10, 20])
+        self.assertEqual([10, 20], result.sizes)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,12 @@
+"""Helpers shared by the inline test cases."""
+from __future__ import annotations
+
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+
+def temporary_directory(test: TestCase) -> str:
+    """Create a directory that is removed once the test has finished."""
+    directory = TemporaryDirectory()
+    test.addCleanup(directory.cleanup)
+    return directory.name
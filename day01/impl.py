@@ -1,10 +1,20 @@
 #!/usr/bin/env python3
+from collections import defaultdict
 from functools import reduce
-from itertools import combinations
+from itertools import combinations, islice
 from operator import mul
 from os.path import dirname
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+TARGET = 2020
+VECTORIZE_FROM = 10_000
+BLOCK_CELLS = 1 << 22
+
 
 class PuzzleTests(unittest.TestCase):
 
@@ -16,17 +26,219 @@ class PuzzleTests(unittest.TestCase):
     def test_example_triples(self):
         self.assertEqual(puzzle(self.input, 3), 241861950)
 
+    def test_other_target(self):
+        self.assertEqual(puzzle(self.input, 2, target=1345), 366 * 979)
+
+    def test_all_solutions(self):
+        numbers = [1, 2, 3, 4, 5, 5, 6]
+        self.assertEqual(k_sum(numbers, 2, 10, find_all=True), [(5, 5), (4, 6)])
+        self.assertEqual(
+            sorted(k_sum(numbers, 3, 10, find_all=True)),
+            [(1, 3, 6), (1, 4, 5), (2, 3, 5)],
+        )
+
+    def test_singles_and_misses(self):
+        self.assertEqual(k_sum([3, 7], 1, 7), [(7,)])
+        self.assertEqual(k_sum([5], 2, 10), [])
+        self.assertEqual(k_sum(self.input, 3, 1), [])
+        with self.assertRaises(ValueError):
+            puzzle(self.input, 2, target=1)
+        with self.assertRaises(ValueError):
+            k_sum(self.input, 0)
+
+    def test_meet_in_the_middle_matches_brute_force(self):
+        numbers = [-4, -1, 0, 2, 3, 3, 5, 8, 11, 13]
+        for count in (4, 5, 6):
+            for target in range(-5, 30):
+                expected = sorted({
+                    combination
+                    for combination in combinations(sorted(numbers), count)
+                    if sum(combination) == target
+                })
+                self.assertEqual(sorted(k_sum(numbers, count, target, find_all=True)), expected)
+
+    def test_backend_choice(self):
+        self.assertEqual(_backend(self.input, 2, None), "python")
+        self.assertEqual(_backend(self.input, 2, "python"), "python")
+        large = range(VECTORIZE_FROM)
+        self.assertEqual(_backend(large, 2, None), "numpy" if numpy else "python")
+        self.assertEqual(_backend(large, 4, None), "python")
+        with self.assertRaises(ValueError):
+            _backend(self.input, 2, "fortran")
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_numpy_matches_python(self):
+        numbers = [1, 2, 3, 4, 5, 5, 6, 10, -3, 0, 13]
+        for count in (2, 3):
+            for target in range(-15, 45):
+                self.assertEqual(
+                    sorted(k_sum(numbers, count, target, find_all=True, backend="numpy")),
+                    sorted(k_sum(numbers, count, target, find_all=True, backend="python")),
+                )
+        self.assertEqual(puzzle(self.input, 3, backend="numpy"), 241861950)
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_numpy_blocks_match_python(self):
+        numbers = [value * value % 997 - 300 for value in range(400)]
+        values = numpy.sort(numpy.asarray(numbers))
+        for target in (-900, -5, 0, 17, 500, 1500, 2100, 10 ** 9):
+            with self.subTest(target=target):
+                self.assertEqual(
+                    sorted(set(_triples_numpy(values, 3, target, block_cells=1000))),
+                    sorted(k_sum(numbers, 3, target, find_all=True)),
+                )
+
+    @unittest.skipIf(numpy, "numpy is installed")
+    def test_numpy_backend_requires_numpy(self):
+        with self.assertRaises(ImportError):
+            k_sum(self.input, 2, backend="numpy")
+
 
 def product(values):
     """Calculate the product of the values."""
     return reduce(mul, values, 1)
 
 
-def puzzle(numbers, count):
-    """Find the product of the numbers that sum to 2020."""
-    for combination in combinations(numbers, count):
-        if sum(combination) == 2020:
-            return product(combination)
+def _singles(values, _, target):
+    if target in values:
+        yield target,
+
+
+def _pairs(values, _, target):
+    """Look up each value's complement among the values before it."""
+    seen = set()
+    for value in values:
+        if target - value in seen:
+            yield target - value, value
+        seen.add(value)
+
+
+def _triples(values, _, target):
+    """Fix the smallest value, then close two pointers over the rest."""
+    last = len(values) - 1
+    for first in range(last - 1):
+        value = values[first]
+        if value + values[first + 1] + values[first + 2] > target:
+            break
+        if first and value == values[first - 1] or value + values[last - 1] + values[last] < target:
+            continue
+        low, high = first + 1, last
+        while low < high:
+            total = value + values[low] + values[high]
+            if total < target:
+                low += 1
+            elif total > target:
+                high -= 1
+            else:
+                yield value, values[low], values[high]
+                low += 1
+                while low < high and values[low] == values[low - 1]:
+                    low += 1
+
+
+def _meet_in_the_middle(values, count, target):
+    """Match sums of the lower half of each combination's indices against the upper half."""
+    half = count // 2
+    lower = defaultdict(list)
+    for indices in combinations(range(len(values)), half):
+        lower[sum(values[index] for index in indices)].append(indices)
+    for indices in combinations(range(half, len(values)), count - half):
+        for other in lower.get(target - sum(values[index] for index in indices), ()):
+            if other[-1] < indices[0]:
+                yield tuple(values[index] for index in other + indices)
+
+
+def _pairs_numpy(values, _, target):
+    """Binary search every sorted value's complement at once."""
+    complements = target - values
+    available = (
+        numpy.searchsorted(values, complements, side="right")
+        - numpy.searchsorted(values, complements, side="left")
+        - (complements == values).astype(values.dtype)
+    )
+    for value in numpy.unique(values[(available > 0) & (values <= complements)]):
+        yield value.item(), (target - value).item()
+
+
+def _triples_numpy(values, _, target, block_cells=BLOCK_CELLS):
+    """Broadcast sums of a block of smallest values against the middle ones.
+
+    The largest value of each triple is looked up with a binary search; it
+    must sit after the middle one, which must sit after the smallest. Rows
+    and columns that cannot reach the target even with the largest values,
+    or that overshoot it even with the smallest, are never broadcast.
+    """
+    size = len(values)
+    if size < 3:
+        return
+    rows = max(1, block_cells // size)
+    lowest = numpy.searchsorted(values, target - values[-1] - values[-2], side="left")
+    for start in range(min(lowest, size - 2), size - 2, rows):
+        if values[start] + values[start + 1] + values[start + 2] > target:
+            break
+        end = min(start + rows, size - 2)
+        low = max(start + 1, numpy.searchsorted(values, target - values[end - 1] - values[-1], side="left"))
+        high = numpy.searchsorted(values, (target - values[start]) / 2, side="right")
+        if low >= high:
+            continue
+        first = numpy.arange(start, end)[:, None]
+        second = numpy.arange(low, high)[None, :]
+        complements = target - values[start:end, None] - values[None, low:high]
+        third = numpy.searchsorted(values, complements, side="right") - 1
+        found = (
+            (second > first)
+            & (third > second)
+            & (values[third.clip(0)] == complements)
+        )
+        for row, column in zip(*numpy.nonzero(found)):
+            yield (
+                values[start + row].item(),
+                values[low + column].item(),
+                complements[row, column].item(),
+            )
+
+
+_SOLVERS = {1: _singles, 2: _pairs, 3: _triples}
+_NUMPY_SOLVERS = {2: _pairs_numpy, 3: _triples_numpy}
+
+
+def _backend(values, count, backend):
+    """Pick the backend, vectorizing large pair and triple searches when numpy is available."""
+    if backend is None:
+        vectorize = numpy is not None and count in _NUMPY_SOLVERS and len(values) >= VECTORIZE_FROM
+        return "numpy" if vectorize else "python"
+    if backend not in ("python", "numpy"):
+        raise ValueError(f"unknown backend: {backend}")
+    if backend == "numpy" and numpy is None:
+        raise ImportError("the numpy backend needs numpy installed")
+    return backend
+
+
+def k_sum(numbers, count, target=TARGET, find_all=False, backend=None):
+    """Find count of the numbers that sum to the target, as sorted tuples of values.
+
+    Only the first combination found is returned unless find_all is set, in
+    which case every distinct combination of values is. The backend is
+    "python" or "numpy"; by default numpy is used for large lists when it
+    is installed.
+    """
+    if count < 1:
+        raise ValueError("count must be positive")
+    values = list(numbers)
+    if _backend(values, count, backend) == "numpy" and count in _NUMPY_SOLVERS:
+        solutions = _NUMPY_SOLVERS[count](numpy.sort(numpy.asarray(values)), count, target)
+    else:
+        values.sort()
+        solutions = _SOLVERS.get(count, _meet_in_the_middle)(values, count, target)
+    if not find_all:
+        return list(islice(solutions, 1))
+    return list(dict.fromkeys(solutions))
+
+
+def puzzle(numbers, count, target=TARGET, backend=None):
+    """Find the product of the numbers that sum to the target."""
+    for combination in k_sum(numbers, count, target, backend=backend):
+        return product(combination)
     raise ValueError("no combination found")
 
 
@@ -36,5 +248,4 @@ if __name__ == "__main__":
         print(puzzle([
             int(line.strip())
             for line in f.readlines()
-        ], int(sys.argv[1])))
-
+        ], int(sys.argv[1]), *map(int, sys.argv[2:3])))
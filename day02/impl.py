@@ -1,7 +1,15 @@
 #!/usr/bin/env python3
-from os.path import dirname
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from os.path import dirname, join
+from tempfile import TemporaryDirectory
+import mmap
 import unittest
 
+from aoc.inputs import chunks
+
+CHUNK_SIZE = 1 << 24
+
 
 class PuzzleTest(unittest.TestCase):
 
@@ -13,29 +21,99 @@ class PuzzleTest(unittest.TestCase):
 
     def test_example(self):
         self.assertEqual(puzzle(self.example), 1)
+        self.assertEqual(puzzle(self.example, "count"), 2)
     
     def test_validate(self):
         self.assertTrue(validate("1-3 a: abcde"))
         self.assertFalse(validate("1-3 b: cdefg"))
+        self.assertTrue(validate("1-3 b: cdbfg", "count"))
+        for line in ("1-3 a abcde", "1-3 a: ab cde", "1+3 a: abcde", "1-x a: abcde"):
+            with self.assertRaises(ValueError):
+                validate(line)
+        with self.assertRaises(ValueError):
+            validate("1-3 a: abcde", "length")
+
+    def test_count_valid(self):
+        with TemporaryDirectory() as directory:
+            path = join(directory, "input.txt")
+            with open(path, "w") as f:
+                f.write("\r\n".join(self.example * 50))
+            self.assertEqual(count_valid(path, chunk_size=100, jobs=2), 50)
+            self.assertEqual(count_valid(path, "count", chunk_size=100, jobs=1), 100)
+            self.assertEqual(count_valid(path, "count"), 100)
+
+
+def positional(low, high, char, password):
+    """Exactly one of the two 1-based positions holds the character."""
+    return (password[low - 1:low] == char) != (password[high - 1:high] == char)
+
+
+def counted(low, high, char, password):
+    """The character occurs between low and high times."""
+    return low <= password.count(char) <= high
+
+
+POLICIES = dict(positional=positional, count=counted)
+
+
+def _policy(name):
+    try:
+        return POLICIES[name]
+    except KeyError:
+        raise ValueError(f"unknown policy: {name}") from None
+
+
+def _bounds(span, line):
+    try:
+        low, high = map(int, span.split(b"-" if isinstance(span, bytes) else "-"))
+    except ValueError:
+        raise ValueError(f"malformed line: {line!r}") from None
+    return low, high
+
+
+def _count(lines, check):
+    """Count the valid lines, str or bytes, converting each distinct "low-high" once."""
+    bounds = {}
+    valid = 0
+    for line in lines:
+        try:
+            span, char, password = line.split()
+            low, high = bounds[span]
+        except KeyError:
+            low, high = bounds[span] = _bounds(span, line)
+        except ValueError:
+            raise ValueError(f"malformed line: {line!r}") from None
+        if len(char) != 2:
+            raise ValueError(f"malformed line: {line!r}")
+        valid += check(low, high, char[:1], password)
+    return valid
+
+
+def validate(line, policy="positional"):
+    return bool(_count([line], _policy(policy)))
+
+
+def puzzle(passwords, policy="positional"):
+    return _count(passwords, _policy(policy))
 
 
-def validate(line):
-    pattern, value = line.split(": ")
-    first_second, char = pattern.split(" ")
-    first, second = map(int, first_second.split("-"))
-    return (value[first - 1] == char) ^ (value[second - 1] == char)
+def _count_chunk(path, start, end, policy):
+    """Count the valid lines between two byte offsets of the mapped file."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return _count(filter(None, mapped[start:end].splitlines()), POLICIES[policy])
 
 
-def puzzle(passwords):
-    return sum(
-        1 if validate(password) else 0
-        for password in passwords
-    )
+def count_valid(path, policy="positional", jobs=None, chunk_size=CHUNK_SIZE):
+    """Count the valid passwords in a file, splitting large ones across worker processes."""
+    _policy(policy)
+    ranges = chunks(path, chunk_size)
+    if len(ranges) <= 1 or jobs == 1:
+        return sum(_count_chunk(path, start, end, policy) for start, end in ranges)
+    starts, ends = zip(*ranges)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return sum(executor.map(_count_chunk, repeat(path), starts, ends, repeat(policy)))
 
 
 if __name__ == "__main__":
-    with open(f"{dirname(__file__)}/input.txt") as f:
-        print(puzzle([
-            line.strip()
-            for line in f.readlines()
-        ]))
+    import sys
+    print(count_valid(f"{dirname(__file__)}/input.txt", *sys.argv[1:2]))
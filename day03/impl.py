@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 from functools import reduce
-from operator import mul
+from itertools import islice, repeat
+from operator import and_, mod, mul, rshift
 from os.path import dirname
 from textwrap import dedent
 import unittest
 
+TREES = str.maketrans(".#", "01")
+
 
 class PuzzleTest(unittest.TestCase):
 
@@ -25,27 +28,80 @@ class PuzzleTest(unittest.TestCase):
     def test_check_slope(self):
         self.assertEqual(check_slope(self.example, (3, 1)), 7)
 
+    def test_count_trees(self):
+        slopes = [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)]
+        self.assertEqual(count_trees(parse(self.example), slopes), [2, 7, 3, 4, 2])
+        self.assertEqual(puzzle(self.example, slopes), 336)
+        with self.assertRaises(ValueError):
+            count_trees(parse(self.example), [(1, 0)])
+
+    def test_parse(self):
+        width, rows = parse("#..\n.#.")
+        self.assertEqual(width, 3)
+        self.assertEqual(rows, [0b100, 0b010])
+
+    @staticmethod
+    def walk(map, slope):
+        """Count trees on one slope cell by cell, as this day originally did."""
+        lines = map.split()
+        dx, dy = slope
+        return sum(
+            lines[y][(y // dy * dx) % len(lines[0])] == "#"
+            for y in range(0, len(lines), dy)
+        )
+
+    def test_matches_walking_each_slope(self):
+        slopes = [(dx, dy) for dx in (0, 1, 4, 11, 13, 25) for dy in (1, 2, 3, 12)]
+        self.assertEqual(
+            count_trees(parse(self.example), slopes),
+            [self.walk(self.example, slope) for slope in slopes],
+        )
+
 
 def product(values):
     return reduce(mul, values, 1)
 
 
-def check_slope(map, slope):
-    x, y = 0, 0
-    dx, dy = slope
-    lines = map.split()
-    width = len(lines[0])
-    height = len(lines)
-    trees = 0
-    while y < height:
-        trees += lines[y][x] == "#"
-        x = (x + dx) % width
-        y = (y + dy)
+def parse(data):
+    """Pack each row of the map into an int, read as binary with trees as ones.
+
+    Column x of a row of width w is bit w - 1 - x.
+    """
+    lines = data.translate(TREES).split()
+    return len(lines[0]), list(map(int, lines, repeat(2)))
+
+
+def count_trees(grid, slopes):
+    """Count the trees hit on each slope, stepping it directly over its own rows.
+
+    Each slope only visits every dy-th row, and the shifts, masks and sum
+    all run in C through map.
+    """
+    width, rows = grid
+    trees = []
+    for dx, dy in slopes:
+        if dy < 1:
+            raise ValueError("slopes must move down")
+        steps = (len(rows) + dy - 1) // dy
+        dx %= width
+        if dx:
+            shifts = map(mod, range(width - 1, width - 1 - steps * dx, -dx), repeat(width))
+        else:
+            shifts = repeat(width - 1, steps)
+        trees.append(sum(map(and_, map(rshift, islice(rows, 0, None, dy), shifts), repeat(1))))
     return trees
 
 
+def check_slope(map, slope):
+    return count_trees(parse(map), [slope])[0]
+
+
+def solve(grid, slopes):
+    return product(count_trees(grid, slopes))
+
+
 def puzzle(map, slopes):
-    return product(check_slope(map, slope) for slope in slopes)
+    return solve(parse(map), slopes)
 
 
 if __name__ == "__main__":
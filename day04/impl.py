@@ -2,36 +2,56 @@
 from os.path import dirname
 import re
 from textwrap import dedent
+from typing import Callable, NamedTuple
 import unittest
 
+from aoc.inputs import records
+
 VALID_EYE_COLOURS = ("amb", "blu", "brn", "gry", "grn", "hzl", "oth")
+HEIGHTS = {"cm": (3, 150, 193), "in": (2, 59, 76)}
+FIELD = re.compile(r"([^\s:]+):(\S*)")
+
+
+def _number(s, digits, min_, max_):
+    return len(s) == digits and s.isascii() and s.isdigit() and min_ <= int(s) <= max_
 
 
 def valid_year(min_, max_):
     def valid(s):
-        return re.match(r"^\d{4}$", s) is not None and min_ <= int(s) <= max_
+        return _number(s, 4, min_, max_)
     return valid
 
 
 def valid_height(s):
-    if re.match(r"^\d{3}cm$", s):
-        return 150 <= int(s[:-2]) <= 193
-    elif re.match(r"^\d{2}in$", s):
-        return 59 <= int(s[:-2]) <= 76
-    return False
+    try:
+        digits, min_, max_ = HEIGHTS[s[-2:]]
+    except KeyError:
+        return False
+    return _number(s[:-2], digits, min_, max_)
 
 
 RULES = dict(
     byr=valid_year(1920, 2002),
-    ecl=lambda s: s in VALID_EYE_COLOURS,
+    ecl=frozenset(VALID_EYE_COLOURS).__contains__,
     eyr=valid_year(2020, 2030),
-    hcl=re.compile(r"^#[0-9a-f]{6}$").match,
+    hcl=re.compile(r"#[0-9a-f]{6}").fullmatch,
     hgt=valid_height,
     iyr=valid_year(2010, 2020),
-    pid=re.compile(r"^\d{9}$").match,
+    pid=re.compile(r"\d{9}").fullmatch,
 )
 
 
+class Plan(NamedTuple):
+    """Rules prepared for validating raw records."""
+    markers: tuple[str, ...]
+    checks: dict[str, Callable[[str], object]]
+
+
+def compile_rules(rules):
+    """Build a plan that rejects records missing a field before splitting them."""
+    return Plan(tuple(f"{field}:" for field in rules), dict(rules))
+
+
 class PuzzleTest(unittest.TestCase):
 
     example = dedent("""
@@ -64,7 +84,23 @@ class PuzzleTest(unittest.TestCase):
     """.strip())
 
     def test_example(self):
-        self.assertEqual(puzzle(self.example, RULES), 4)
+        self.assertEqual(puzzle(self.example.split("\n\n"), RULES), 4)
+        self.assertEqual(solve(parse(self.example.split("\n\n")), RULES), 4)
+
+    def test_validate(self):
+        plan = compile_rules(RULES)
+        records = self.example.split("\n\n")
+        self.assertEqual(
+            [validate(record, plan) for record in records],
+            [False, False, False, False, True, True, True, True],
+        )
+        self.assertFalse(validate(records[4].replace("byr:", "xbyr:"), plan))
+        self.assertFalse(validate(records[4].replace("hgt:74in", "hgt:74"), plan))
+        self.assertFalse(validate(records[4] + " byr:1900", plan))
+
+    def test_fields(self):
+        self.assertEqual(fields("ecl:gry\npid:8 hcl:#fff"), [("ecl", "gry"), ("pid", "8"), ("hcl", "#fff")])
+        self.assertEqual(fields("eyr:20:30 iyr"), [("eyr", "20:30")])
 
     def test_byr_valid(self):
         for byr in range(1920, 2003):
@@ -120,6 +156,8 @@ class PuzzleTest(unittest.TestCase):
             with self.subTest(hgt=f"{hgt}in"):
                 self.assertFalse(RULES["hgt"](f"{hgt}in"))
         self.assertFalse(RULES["hgt"]("foo"))
+        self.assertFalse(RULES["hgt"]("170"))
+        self.assertFalse(RULES["hgt"]("+60in"))
 
     def test_iyr_valid(self):
         for iyr in range(2010, 2021):
@@ -137,29 +175,46 @@ class PuzzleTest(unittest.TestCase):
                 self.assertTrue(RULES["pid"](pid))
 
     def test_pid_invalid(self):
-        for pid in ("8960565390", "foo"):
+        for pid in ("8960565390", "foo", "96056539\n"):
             with self.subTest(pid=pid):
                 self.assertFalse(RULES["pid"](pid))
 
 
-def parse(data):
-    return dict(s.split(":") for s in data.split())
+def fields(record):
+    """Split a raw record into its (field, value) pairs."""
+    return FIELD.findall(record)
+
+
+def parse(passports):
+    return [fields(passport) for passport in passports]
+
+
+def check(pairs, plan):
+    """Check a record's pairs, stopping at the first failure."""
+    seen = set()
+    for field, value in pairs:
+        rule = plan.checks.get(field)
+        if rule is not None:
+            if not rule(value):
+                return False
+            seen.add(field)
+    return len(seen) == len(plan.checks)
+
+
+def validate(record, plan):
+    """Check a raw record, rejecting it before splitting if a field is missing."""
+    return all(marker in record for marker in plan.markers) and check(fields(record), plan)
 
 
-def is_valid(passport, rules):
-    return all(
-        field in passport and valid(passport[field])
-        for field, valid in rules.items()
-    )
+def solve(passports, rules=RULES):
+    plan = compile_rules(rules)
+    return sum(check(pairs, plan) for pairs in passports)
 
 
-def puzzle(data, rules):
-    return sum(
-        is_valid(parse(passport), rules)
-        for passport in data.split("\n\n")
-    )
+def puzzle(passports, rules=RULES):
+    plan = compile_rules(rules)
+    return sum(validate(passport, plan) for passport in passports)
 
 
 if __name__ == "__main__":
-    with open(f"{dirname(__file__)}/input.txt") as f:
-        print(puzzle(f.read().strip(), RULES))
+    print(puzzle(records(f"{dirname(__file__)}/input.txt"), RULES))
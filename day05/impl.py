@@ -1,8 +1,13 @@
 #!/usr/bin/env python
+from functools import partial
 from os.path import dirname
 from textwrap import dedent
 import unittest
 
+BINARY = str.maketrans("FBLR", "0101")
+BINARY_BYTES = bytes.maketrans(b"FBLR", b"0101")
+CHUNK_SIZE = 1 << 20
+
 
 class PuzzleTest(unittest.TestCase):
 
@@ -30,28 +35,84 @@ class PuzzleTest(unittest.TestCase):
             FBFBBFBLRL
         """.strip())), 359)
 
+    def test_seat_ids(self):
+        self.assertEqual(list(seat_ids("FBFBBFFRLR\nBBFFBBFRLL")), [357, 820])
+        self.assertEqual(list(seat_ids(b"FBFBBFFRLR\r\nBBFFBBFRLL\n")), [357, 820])
+        passes = "\n".join(["FBFBBFFRLR", "BBFFBBFRLL", "FFFBBBFRRR"] * 5)
+        for chunk_size in (1, 11, 12, 25, 1000):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(list(seat_ids(passes, chunk_size)), [357, 820, 119] * 5)
+
+    def test_bisect(self):
+        self.assertEqual(bisect("FBFBBFF", "F"), 44)
+        self.assertEqual(bisect("RLR", "L"), 5)
+
+    def test_missing_seat(self):
+        self.assertEqual(missing_seat([7, 4, 3, 6]), 5)
+        self.assertEqual(missing_seat([1, 3]), 2)
+        for ids in ([3, 4, 5], [3, 6], [], [1, 1, 3, 5], [1, 1, 3], [-1, 1]):
+            with self.subTest(ids=ids):
+                with self.assertRaises(ValueError):
+                    missing_seat(ids)
+
 
 def bisect(code, front):
-    options = list(range(2 ** len(code)))
+    position = 0
     for char in code:
-        if char == front:
-            options = options[:len(options)//2]
-        else:
-            options = options[len(options)//2:]
-    return options[0]
+        position = position * 2 + (char != front)
+    return position
 
 
 def seat_id(seat):
-    return (bisect(seat[:7], "F") * 8) + bisect(seat[7:], "L")
+    return int(seat.translate(BINARY), 2)
+
+
+def seat_ids(data, chunk_size=CHUNK_SIZE):
+    """Decode whitespace-separated boarding passes, given as str or bytes, to seat IDs.
+
+    Each pass is its seat ID written in binary, so translating the letters
+    to digits is all the decoding needed. The data is translated a chunk
+    of lines at a time, so the copies made are bounded by chunk_size.
+    """
+    table, newline = (BINARY, "\n") if isinstance(data, str) else (BINARY_BYTES, b"\n")
+    decode = partial(int, base=2)
+    start, size = 0, len(data)
+    while start < size:
+        end = data.find(newline, min(start + chunk_size, size) - 1)
+        end = size if end == -1 else end + 1
+        yield from map(decode, data[start:end].translate(table).split())
+        start = end
+
+
+def missing_seat(ids):
+    """Find the one seat missing between the lowest and highest IDs.
+
+    The IDs are marked in a bitmap as they arrive, which also catches any
+    seat given twice.
+    """
+    seen = bytearray()
+    lowest = highest = None
+    for id_ in ids:
+        if id_ < 0:
+            raise ValueError(f"invalid seat: {id_}")
+        if id_ >= len(seen):
+            seen.extend(bytes(max(id_ + 1, 2 * len(seen)) - len(seen)))
+        elif seen[id_]:
+            raise ValueError(f"duplicate seat: {id_}")
+        seen[id_] = 1
+        if lowest is None or id_ < lowest:
+            lowest = id_
+        if highest is None or id_ > highest:
+            highest = id_
+    if lowest is None or seen.count(0, lowest, highest) != 1:
+        raise ValueError("expected exactly one missing seat")
+    return seen.find(0, lowest, highest)
 
 
 def puzzle(data):
-    present = sorted(seat_id(seat) for seat in data.split())
-    for index in range(1, len(present)):
-        if present[index - 1] != present[index] - 1:
-            return present[index] - 1
+    return missing_seat(seat_ids(data))
 
 
 if __name__ == "__main__":
-    with open(f"{dirname(__file__)}/input.txt") as f:
-        print(puzzle(f.read().strip()))
+    with open(f"{dirname(__file__)}/input.txt", "rb") as f:
+        print(puzzle(f.read()))
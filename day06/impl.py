@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
+from functools import reduce
+from operator import and_, or_
 from os.path import dirname
+from string import ascii_lowercase
 from textwrap import dedent
 import unittest
 
+from aoc.inputs import records
+
+BITS = {char: 1 << index for index, char in enumerate(ascii_lowercase)}
+MODES = dict(anyone=or_, everyone=and_)
+
 
 class PuzzleTest(unittest.TestCase):
     example = dedent("""
@@ -24,20 +32,62 @@ class PuzzleTest(unittest.TestCase):
     """.strip())
 
     def test_puzzle(self):
-        self.assertEqual(puzzle(self.example), 6)
+        self.assertEqual(puzzle(self.example.split("\n\n")), 6)
+        self.assertEqual(puzzle(self.example.split("\n\n"), "anyone"), 11)
+
+    def test_answers(self):
+        self.assertEqual(answers("ca"), 0b101)
+        self.assertEqual(answers("zz"), 1 << 25)
+        with self.assertRaises(ValueError):
+            answers("aB")
+
+    def test_group_answers(self):
+        self.assertEqual(group_answers("ab\nac", "anyone"), 0b111)
+        self.assertEqual(group_answers("ab\nac", "everyone"), 0b001)
+        with self.assertRaises(ValueError):
+            group_answers("ab", "someone")
+        self.assertEqual(group_answers("", "everyone"), 0)
+
+    def test_invalid_answers(self):
+        for mode in MODES:
+            with self.subTest(mode=mode):
+                with self.assertRaises(ValueError):
+                    group_answers("aB\nB1", mode)
+                with self.assertRaises(ValueError):
+                    puzzle(["aB\nB1"], mode)
+
+
+def answers(person):
+    """Pack the questions one person answered into a 26-bit mask."""
+    try:
+        return reduce(or_, map(BITS.__getitem__, person), 0)
+    except KeyError as error:
+        raise ValueError(f"unexpected answer: {error.args[0]!r}") from None
+
+
+def _combine(mode):
+    try:
+        return MODES[mode]
+    except KeyError:
+        raise ValueError(f"unknown mode: {mode}") from None
+
+
+def _group_mask(group, combine):
+    people = group.split()
+    return reduce(combine, map(answers, people)) if people else 0
+
+
+def group_answers(group, mode="everyone"):
+    """Combine a group's answers: questions anyone answered, or everyone did."""
+    return _group_mask(group, _combine(mode))
 
 
-def puzzle(data):
-    total = 0
-    for group in data.split("\n\n"):
-        people = group.split()
-        answers = set(people[0])
-        for person in people[1:]:
-            answers.intersection_update(person)
-        total += len(answers)
-    return total
+def puzzle(groups, mode="everyone"):
+    """Sum the popcount of each group's combined answer mask."""
+    combine = _combine(mode)
+    return sum(bin(_group_mask(group, combine)).count("1") for group in groups)
 
 
 if __name__ == "__main__":
-    with open(f"{dirname(__file__)}/input.txt") as f:
-        print(puzzle(f.read().strip()))
+    import sys
+    print(puzzle(records(f"{dirname(__file__)}/input.txt"), *sys.argv[1:2]))
@@ -1,13 +1,29 @@
 #!/usr/bin/env python3
-from collections import defaultdict
+from collections import deque
 from os.path import dirname
 import re
 from textwrap import dedent
+from typing import Any, Optional
 import unittest
 
+RULE = re.compile(r"(\w+ \w+) bags contain")
+CONTENT = re.compile(r"(\d+) (\w+ \w+) bags?")
+
 
 class PuzzleTest(unittest.TestCase):
 
+    example = dedent("""
+        light red bags contain 1 bright white bag, 2 muted yellow bags.
+        dark orange bags contain 3 bright white bags, 4 muted yellow bags.
+        bright white bags contain 1 shiny gold bag.
+        muted yellow bags contain 2 shiny gold bags, 9 faded blue bags.
+        shiny gold bags contain 1 dark olive bag, 2 vibrant plum bags.
+        dark olive bags contain 3 faded blue bags, 4 dotted black bags.
+        vibrant plum bags contain 5 faded blue bags, 6 dotted black bags.
+        faded blue bags contain no other bags.
+        dotted black bags contain no other bags.
+    """.strip())
+
     def test_example_1(self):
         example = dedent("""
             light red bags contain 1 bright white bag, 2 muted yellow bags.
@@ -34,40 +50,110 @@ class PuzzleTest(unittest.TestCase):
         """.strip())
         self.assertEqual(126, puzzle(example, "shiny gold"))
 
+    def test_containers(self):
+        graph = parse(self.example)
+        self.assertEqual(
+            {"bright white", "muted yellow", "dark orange", "light red"},
+            graph.containers("shiny gold"),
+        )
+        self.assertEqual(set(), graph.containers("light red"))
+        self.assertEqual(set(), graph.containers("plaid magenta"))
+
+    def test_inside(self):
+        graph = parse(self.example)
+        self.assertEqual(0, graph.inside("faded blue"))
+        self.assertEqual(7, graph.inside("dark olive"))
+        self.assertEqual(0, graph.inside("plaid magenta"))
+
+    def test_deep_chain(self):
+        depth = 20_000
+        graph = BagGraph({f"bag {level}": {f"bag {level + 1}": 1} for level in range(depth)})
+        self.assertEqual(depth, graph.inside("bag 0"))
+        self.assertEqual(depth, len(graph.containers(f"bag {depth}")))
+
+    def test_cycle(self):
+        with self.assertRaises(ValueError):
+            BagGraph({"a": {"b": 1}, "b": {"a": 1}})
+
+
+class BagGraph:
+    """Bag rules as a graph of what each bag contains and what contains it.
 
-def memoize(func):
-    def wrapper(*args):
-        if args not in wrapper.cache:
-            wrapper.cache[args] = func(*args)
-        return wrapper.cache[args]
-    wrapper.cache = {}
-    return wrapper
+    The bags are ordered once so that every bag comes after all the bags it
+    contains, and the totals inside every bag are then filled in along that
+    order without recursion, the first time one is asked for.
+    """
+
+    def __init__(self, contents: dict[str, dict[str, int]]):
+        self.contents = {bag: dict(inner) for bag, inner in contents.items()}
+        for inner in contents.values():
+            for bag in inner:
+                self.contents.setdefault(bag, {})
+        self.holders: dict[str, list[str]] = {bag: [] for bag in self.contents}
+        for bag, inner in self.contents.items():
+            for held in inner:
+                self.holders[held].append(bag)
+        self.order = self._order()
+        self._inside: Optional[dict[str, int]] = None
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, BagGraph) and self.contents == other.contents
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self.contents)} bags)"
+
+    def _order(self) -> list[str]:
+        """Order the bags innermost first, rejecting rules with a cycle."""
+        remaining = {bag: len(inner) for bag, inner in self.contents.items()}
+        order = [bag for bag, count in remaining.items() if count == 0]
+        for bag in order:
+            for holder in self.holders[bag]:
+                remaining[holder] -= 1
+                if remaining[holder] == 0:
+                    order.append(holder)
+        if len(order) != len(self.contents):
+            raise ValueError("bag rules contain a cycle")
+        return order
+
+    def inside(self, bag: str) -> int:
+        """Count the bags inside the given bag."""
+        if self._inside is None:
+            totals: dict[str, int] = {}
+            for current in self.order:
+                totals[current] = sum(
+                    count * (1 + totals[held])
+                    for held, count in self.contents[current].items()
+                )
+            self._inside = totals
+        return self._inside.get(bag, 0)
+
+    def containers(self, bag: str) -> set[str]:
+        """Find the bags that can eventually contain the given bag."""
+        found: set[str] = set()
+        pending = deque(self.holders.get(bag, ()))
+        while pending:
+            holder = pending.popleft()
+            if holder not in found:
+                found.add(holder)
+                pending.extend(self.holders[holder])
+        return found
 
 
 def puzzle(rules, start):
-    containers = create_container_map(rules)
-
-    @memoize
-    def contains(bag):
-        if bag not in containers:
-            return 0
-        return sum(
-            count * (1 + contains(container))
-            for container, count in containers[bag].items()
-        )
+    return solve(parse(rules), start)
+
 
-    return contains(start)
+def solve(graph, start):
+    return graph.inside(start)
 
 
-def create_container_map(rules):
-    """Create mapping from bags to the bags that they can contain."""
-    containers = defaultdict(dict)
+def parse(rules):
+    """Create the graph of which bags contain which."""
+    contents = {}
     for rule in rules.split("\n"):
-        start, = re.findall(r"(\w+ \w+) bags contain", rule)
-        contained = re.findall(r"(\d+) (\w+ \w+) bags?", rule)
-        for number, bag in contained:
-            containers[start][bag] = int(number)
-    return containers
+        start, = RULE.findall(rule)
+        contents[start] = {bag: int(number) for number, bag in CONTENT.findall(rule)}
+    return BagGraph(contents)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
-from collections import namedtuple
+from array import array
+from collections import defaultdict
 from os.path import dirname
+from typing import NamedTuple
 import unittest
 
 
@@ -21,6 +23,45 @@ class PuzzleTest(unittest.TestCase):
     def test_puzzle(self):
         self.assertEqual(8, puzzle(self.example))
 
+    def test_compile_program(self):
+        program = compile_program(decode(["nop +3", "acc -2", "jmp -1"]))
+        self.assertEqual(array("q", [0, -2, 0]), program.accumulate)
+        self.assertEqual(array("q", [1, 1, -1]), program.jump)
+        self.assertEqual(array("q", [3, 1, 1]), program.changed)
+
+    def test_run(self):
+        program = compile_program(decode(self.example))
+        with self.assertRaises(InfiniteLoop) as loop:
+            run(program)
+        self.assertEqual({0, 1, 2, 4, 6, 7, 3}, loop.exception.visited)
+        self.assertEqual(6, run(program, pointer=8))
+
+    def test_hits(self):
+        program = compile_program(decode(["acc +1", "jmp +2", "acc +5", "acc +1"]))
+        hits = array("q", bytes(8 * len(program.jump)))
+        self.assertEqual(2, run(program, hits=hits))
+        self.assertEqual(6, run(program, pointer=2, hits=hits))
+        self.assertEqual(array("q", [1, 1, 1, 2]), hits)
+
+    def test_terminating(self):
+        self.assertEqual({8}, terminating(compile_program(decode(self.example))))
+        self.assertEqual({0, 1, 2}, terminating(compile_program(decode(["acc +1", "jmp +5", "nop -2"]))))
+
+    def test_repair_matches_trying_every_change(self):
+        lines = decode(self.example)
+        results = set()
+        for index, (op, val) in enumerate(lines):
+            if op in CHANGES:
+                try:
+                    results.add(execute(lines[:index] + [(CHANGES[op], val)] + lines[index + 1:]))
+                except InfiniteLoop:
+                    pass
+        self.assertEqual(results, {repair(compile_program(lines))})
+
+    def test_terminating_program_has_no_loop(self):
+        with self.assertRaises(ValueError):
+            repair(compile_program(decode(["nop +0", "acc +1"])))
+
 
 class InfiniteLoop(Exception):
 
@@ -29,35 +70,54 @@ class InfiniteLoop(Exception):
         self.visited = visited
 
 
-Operation = namedtuple("Operation", ("accumulate", "jump"))
-
+class Program(NamedTuple):
+    """Instructions decoded into columns, indexed by instruction.
 
-def create_operation(op, val):
-    if op == "acc":
-        return Operation(accumulate=val, jump=1)
-    elif op == "jmp":
-        return Operation(accumulate=0, jump=val)
-    return Operation(accumulate=0, jump=1)
+    ``accumulate`` is added to the accumulator and ``jump`` to the pointer;
+    ``changed`` is the jump the instruction would make with jmp and nop
+    swapped.
+    """
+    accumulate: array
+    jump: array
+    changed: array
 
 
 CHANGES = dict(jmp="nop", nop="jmp")
 
 
-def execute(program):
+def compile_program(lines):
+    """Decode (op, value) pairs once into a Program."""
+    accumulate, jump, changed = array("q"), array("q"), array("q")
+    for op, val in lines:
+        accumulate.append(val if op == "acc" else 0)
+        jump.append(val if op == "jmp" else 1)
+        changed.append(val if op == "nop" else 1)
+    return Program(accumulate, jump, changed)
+
+
+def run(program, pointer=0, accumulator=0, hits=None):
+    """Return the value of the accumulator when the compiled program ends.
+
+    If hits is given, its entry for each instruction is incremented every
+    time the instruction runs, so counts can be gathered over many runs.
+    """
+    accumulate, jump = program.accumulate, program.jump
+    end = len(jump)
+    visited = bytearray(end)
+    while pointer < end:
+        if visited[pointer]:
+            raise InfiniteLoop({index for index, seen in enumerate(visited) if seen})
+        visited[pointer] = 1
+        if hits is not None:
+            hits[pointer] += 1
+        accumulator += accumulate[pointer]
+        pointer += jump[pointer]
+    return accumulator
+
+
+def execute(program, pointer=0, accumulator=0):
     """Return the value of the accumulator when the program ends."""
-    accumulator = 0
-    pointer = 0
-    visited = set()
-
-    while True:
-        if pointer in visited:
-            raise InfiniteLoop(visited)
-        if pointer >= len(program):
-            return accumulator
-        visited.add(pointer)
-        op = create_operation(*program[pointer])
-        accumulator += op.accumulate
-        pointer += op.jump
+    return run(compile_program(program), pointer, accumulator)
 
 
 def get_visited(lines):
@@ -69,17 +129,56 @@ def get_visited(lines):
     raise ValueError("no loop found")
 
 
+def decode(program):
+    return [(op, int(val)) for op, val in map(str.split, program)]
+
+
+def terminating(program):
+    """Find the instructions from which the program runs off its end.
+
+    Every instruction's successor is reversed, and the instructions that
+    can reach the end are collected by walking back from it.
+    """
+    end = len(program.jump)
+    sources = defaultdict(list)
+    for index, jump in enumerate(program.jump):
+        sources[min(index + jump, end)].append(index)
+    found = set()
+    pending = [end]
+    while pending:
+        for source in sources[pending.pop()]:
+            if source not in found:
+                found.add(source)
+                pending.append(source)
+    return found
+
+
+def repair(program):
+    """Run the program with the one jmp or nop changed that makes it terminate.
+
+    Walking the looping path once, the first instruction whose changed
+    successor is known to terminate is the fix.
+    """
+    safe = terminating(program)
+    if 0 in safe:
+        raise ValueError("no loop found")
+    accumulate, jump, changed = program.accumulate, program.jump, program.changed
+    end = len(jump)
+    visited = bytearray(end)
+    accumulator, pointer = 0, 0
+    while not visited[pointer]:
+        visited[pointer] = 1
+        if changed[pointer] != jump[pointer]:
+            target = pointer + changed[pointer]
+            if target >= end or target in safe:
+                return run(program, target, accumulator)
+        accumulator += accumulate[pointer]
+        pointer += jump[pointer]
+    raise ValueError("no single change makes the program terminate")
+
+
 def puzzle(program):
-    lines = [(op, int(val)) for op, val in map(str.split, program)]
-    visited = get_visited(lines)
-    for index, (op, val) in enumerate(lines):
-        if index in visited and op in CHANGES:
-            new_program = lines[:]
-            new_program[index] = CHANGES[op], val
-            try:
-                return execute(new_program)
-            except InfiniteLoop:
-                continue
+    return repair(compile_program(decode(program)))
 
 
 if __name__ == "__main__":
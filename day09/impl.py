@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
-from itertools import combinations, islice
+from collections import Counter, deque
+from itertools import islice
 from os.path import dirname
 import unittest
 
@@ -32,29 +33,95 @@ class PuzzleTest(unittest.TestCase):
     def test_puzzle(self):
         self.assertEqual(62, puzzle(self.example, 5))
 
+    def test_invalid_value(self):
+        self.assertEqual(127, invalid_value(iter(self.example), 5))
+        self.assertEqual([127], list(invalid_values(self.example, 5)))
+        with self.assertRaises(ValueError):
+            invalid_value(self.example[:14], 5)
+
+    def test_is_valid(self):
+        self.assertTrue(is_valid(10, [5, 1, 5]))
+        self.assertFalse(is_valid(10, [5, 1, 4]))
+        self.assertTrue(is_valid(40, [15, 25, 47]))
+
+    def test_contiguous_range(self):
+        self.assertEqual((15, 47), contiguous_range(self.example, 127))
+        self.assertEqual((2, 7), contiguous_range(iter([9, 7, 2, 9]), 9))
+        with self.assertRaises(ValueError):
+            contiguous_range([1, 2, 3], 100)
+
+
+def _has_pair(target, counts):
+    return any(
+        target - value in counts and (target - value != value or count > 1)
+        for value, count in counts.items()
+    )
+
 
 def is_valid(target, window):
     """Whether target is the sum of any two numbers in the window."""
-    return any(a + b == target for a, b in combinations(window, 2))
+    return _has_pair(target, Counter(window))
+
+
+def invalid_values(data, preamble):
+    """Yield each number that is not the sum of two of the preamble numbers before it.
+
+    The window is kept as a multiset, updated as it slides, so data can be
+    any iterable of numbers.
+    """
+    numbers = iter(data)
+    window = deque(islice(numbers, preamble))
+    counts = Counter(window)
+    for value in numbers:
+        if not _has_pair(value, counts):
+            yield value
+        oldest = window.popleft()
+        counts[oldest] -= 1
+        if not counts[oldest]:
+            del counts[oldest]
+        window.append(value)
+        counts[value] += 1
 
 
 def invalid_value(data, preamble):
     """Get the first invalid value in data."""
-    for index in range(len(data)):
-        value = data[index + preamble]
-        if not is_valid(value, islice(data, index, index + preamble)):
-            return value
+    for value in invalid_values(data, preamble):
+        return value
+    raise ValueError("no invalid value found")
+
+
+def contiguous_range(data, target):
+    """Get the smallest and largest of the first run of two or more numbers summing to target.
+
+    The numbers must not be negative: the run is a window whose end moves
+    forward with each number and whose start moves forward while the sum
+    is too large, with monotonic deques tracking its minimum and maximum.
+    """
+    window, lows, highs = deque(), deque(), deque()
+    total = 0
+    for value in data:
+        window.append(value)
+        total += value
+        while lows and lows[-1] > value:
+            lows.pop()
+        lows.append(value)
+        while highs and highs[-1] < value:
+            highs.pop()
+        highs.append(value)
+        while total > target:
+            oldest = window.popleft()
+            total -= oldest
+            if lows[0] == oldest:
+                lows.popleft()
+            if highs[0] == oldest:
+                highs.popleft()
+        if total == target and len(window) > 1:
+            return lows[0], highs[0]
+    raise ValueError("no contiguous range found")
 
 
 def puzzle(data, preamble):
-    target = invalid_value(data, preamble)
-    for index in range(len(data)):
-        for length in range(0, len(data) - index):
-            if sum(data[i] for i in range(index, index + length)) == target:
-                return (
-                    min(data[i] for i in range(index, index + length))
-                    + max(data[i] for i in range(index, index + length))
-                )
+    return sum(contiguous_range(data, invalid_value(data, preamble)))
 
 
 if __name__ == "__main__":
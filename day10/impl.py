@@ -1,46 +1,73 @@
 #!/usr/bin/env python3
+from collections import Counter, deque
 from os.path import dirname
+from typing import NamedTuple
 import unittest
 
+GAPS = (1, 2, 3)
+
 
 class PuzzleTest(unittest.TestCase):
 
+    first_example = [16, 10, 15, 5, 1, 11, 7, 19, 6, 12, 4]
+    second_example = [
+        28, 33, 18, 42, 31, 14, 46, 20, 48, 47,
+        24, 23, 49, 45, 19, 38, 39, 11, 1, 32,
+        25, 35, 8, 17, 7, 9, 4, 2, 34, 10, 3,
+    ]
+
     def test_first_example(self):
-        self.assertEqual(8, puzzle([16, 10, 15, 5, 1, 11, 7, 19, 6, 12, 4]))
+        self.assertEqual(8, puzzle(self.first_example))
 
     def test_second_example(self):
-        example = [
-            28, 33, 18, 42, 31, 14, 46, 20, 48, 47,
-            24, 23, 49, 45, 19, 38, 39, 11, 1, 32,
-            25, 35, 8, 17, 7, 9, 4, 2, 34, 10, 3,
-        ]
-        self.assertEqual(19208, puzzle(example))
-
-
-def memoize(func):
-    def wrapper(*args):
-        if args not in wrapper.cache:
-            wrapper.cache[args] = func(*args)
-        return wrapper.cache[args]
-    wrapper.cache = {}
-    return wrapper
-
-
-def puzzle(adapters):
-    last = max(adapters)
-    adapters = set(adapters)
-
-    @memoize
-    def paths(start=0):
-        if start == last:
-            return 1
-        return sum((
-            paths(start + step)
-            for step in (1, 2, 3)
-            if start + step in adapters
-        ))
-
-    return paths()
+        self.assertEqual(19208, puzzle(self.second_example))
+
+    def test_histogram(self):
+        self.assertEqual({1: 7, 3: 5}, analyse(self.first_example).histogram)
+        self.assertEqual({1: 22, 3: 10}, analyse(self.second_example).histogram)
+
+    def test_gaps(self):
+        self.assertEqual(1, puzzle([1, 2, 3], gaps=(1,)))
+        self.assertEqual(0, puzzle([1, 3], gaps=(1,)))
+        self.assertEqual(Chain(1, {2: 3}), analyse([4, 2], gaps=(2,)))
+        with self.assertRaises(ValueError):
+            puzzle([1], gaps=(0, 1))
+
+    def test_long_chain(self):
+        self.assertEqual(1, puzzle(range(3, 300_000, 3)))
+
+
+class Chain(NamedTuple):
+    arrangements: int
+    histogram: dict[int, int]
+
+
+def analyse(adapters, gaps=GAPS):
+    """Count the arrangements of adapters and the gaps between consecutive ones.
+
+    Counts are built bottom-up over the sorted adapters, keeping only those
+    within the largest gap of the current one. The histogram includes the
+    device, which is the largest gap above the highest adapter.
+    """
+    allowed = frozenset(gaps)
+    if not allowed or min(allowed) < 1:
+        raise ValueError("gaps must be positive")
+    widest = max(allowed)
+    window = deque([(0, 1)])
+    histogram = Counter()
+    previous = 0
+    for joltage in sorted(set(adapters)):
+        while window and joltage - window[0][0] > widest:
+            window.popleft()
+        window.append((joltage, sum(count for below, count in window if joltage - below in allowed)))
+        histogram[joltage - previous] += 1
+        previous = joltage
+    histogram[widest] += 1
+    return Chain(window[-1][1] if previous else 0, dict(histogram))
+
+
+def puzzle(adapters, gaps=GAPS):
+    return analyse(adapters, gaps).arrangements
 
 
 if __name__ == "__main__":
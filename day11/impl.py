@@ -1,5 +1,4 @@
 #!/usr/bin/env python3
-from itertools import count
 from os.path import dirname
 from textwrap import dedent
 import unittest
@@ -9,7 +8,6 @@ DIRECTIONS = [
     (+0, -1),           (+0, +1),
     (+1, -1), (+1, +0), (+1, +1),
 ]
-EMPTY = "L"
 FLOOR = "."
 OCCUPIED = "#"
 
@@ -32,55 +30,79 @@ class PuzzleTests(unittest.TestCase):
     def test_puzzle(self):
         self.assertEqual(26, puzzle(self.example))
 
-
-def new_state(seat, neighbours):
-    if seat == EMPTY and all(s != OCCUPIED for s in neighbours):
-        return OCCUPIED
-    elif seat == OCCUPIED and sum(s == OCCUPIED for s in neighbours) >= 5:
-        return EMPTY
-    return seat
-
-
-def create_seat_getter(row_index, seat_index, seat_map):
-    def get_first_seat(direction):
-        row_delta, seat_delta = direction
-        for factor in count(1):
-            neighbour_row = row_index + (row_delta * factor)
-            neighbour_seat = seat_index + (seat_delta * factor)
-            if (
-                neighbour_row < 0
-                or neighbour_row >= len(seat_map)
-                or neighbour_seat < 0
-                or neighbour_seat >= len(seat_map[0])
-            ):
-                return None
-            seat = seat_map[neighbour_row][neighbour_seat]
-            if seat == FLOOR:
-                continue
-            return seat
-    return get_first_seat
-
-
-def get_neighbours(row_index, seat_index, seat_map):
-    seat_getter = create_seat_getter(row_index, seat_index, seat_map)
-    return [seat for seat in map(seat_getter, DIRECTIONS) if seat is not None]
-
-
-def iterate(seat_map):
-    return [
-        [
-            new_state(seat, get_neighbours(row_index, seat_index, seat_map))
-            for seat_index, seat in enumerate(row)
-        ]
-        for row_index, row in enumerate(seat_map)
+    def test_adjacent(self):
+        self.assertEqual(37, puzzle(self.example, line_of_sight=False, threshold=4))
+
+    def test_neighbour_table(self):
+        seats, table = neighbour_table(dedent("""
+            L.L
+            ...
+            L.#
+        """).strip())
+        self.assertEqual(bytearray([0, 0, 0, 1]), seats)
+        self.assertEqual([(1, 2, 3), (0, 2, 3), (0, 1, 3), (0, 1, 2)], table)
+        _, table = neighbour_table("L.L\n...\nL.#", line_of_sight=False)
+        self.assertEqual([(), (), (), ()], table)
+
+    def test_step(self):
+        state = bytearray([0, 1, 1])
+        table = [(1, 2), (0, 2), (0, 1)]
+        self.assertEqual(bytearray([0, 1, 1]), step(state, table, 2))
+        self.assertEqual(bytearray([0, 0, 0]), step(state, table, 1))
+
+
+def neighbour_table(data, line_of_sight=True):
+    """Number the seats, and list the seats each one can see.
+
+    Returns the initial state, one byte per seat set where it is occupied,
+    and for each seat the numbers of the nearest seats in each of the eight
+    directions: directly adjacent ones only, or the first seen past any
+    floor with line_of_sight.
+    """
+    rows = data.split()
+    height, width = len(rows), len(rows[0])
+    positions = [
+        (row_index, seat_index)
+        for row_index, row in enumerate(rows)
+        for seat_index, seat in enumerate(row)
+        if seat != FLOOR
     ]
-
-
-def puzzle(data):
-    seat_map = [list(line) for line in data.split()]
-    while (new_seat_map := iterate(seat_map)) != seat_map:
-        seat_map = new_seat_map
-    return sum(seat == OCCUPIED for row in seat_map for seat in row)
+    numbers = {position: number for number, position in enumerate(positions)}
+    table = []
+    for row_index, seat_index in positions:
+        visible = []
+        for row_delta, seat_delta in DIRECTIONS:
+            row, seat = row_index + row_delta, seat_index + seat_delta
+            while 0 <= row < height and 0 <= seat < width:
+                if (row, seat) in numbers:
+                    visible.append(numbers[row, seat])
+                    break
+                if not line_of_sight:
+                    break
+                row, seat = row + row_delta, seat + seat_delta
+        table.append(tuple(visible))
+    state = bytearray(rows[row][seat] == OCCUPIED for row, seat in positions)
+    return state, table
+
+
+def step(state, table, threshold):
+    """Apply one round: empty seats with no visible occupants fill, crowded ones empty."""
+    new = bytearray(state)
+    for number, visible in enumerate(table):
+        occupied = sum(state[other] for other in visible)
+        if state[number]:
+            if occupied >= threshold:
+                new[number] = 0
+        elif not occupied:
+            new[number] = 1
+    return new
+
+
+def puzzle(data, line_of_sight=True, threshold=5):
+    state, table = neighbour_table(data, line_of_sight)
+    while (new := step(state, table, threshold)) != state:
+        state = new
+    return state.count(1)
 
 
 if __name__ == "__main__":
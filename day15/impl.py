@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+from os.path import dirname
 from unittest import TestCase
 
 
@@ -42,4 +43,5 @@ class PuzzleTests(TestCase):
 
 
 if __name__ == "__main__":
-    print(puzzle([1, 0, 18, 10, 19, 6], 30_000_000))
+    with open(f"{dirname(__file__)}/input.txt") as f:
+        print(puzzle([int(value) for value in f.read().strip().split(",")], 30_000_000))
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from itertools import product
+from os.path import dirname
 from textwrap import dedent
 from typing import Generator
 from unittest import TestCase
@@ -123,13 +124,5 @@ class PuzzleTests(TestCase):
 
 
 if __name__ == "__main__":
-    print(puzzle(dedent("""
-        ##...#.#
-        #..##..#
-        ..#.####
-        .#..#...
-        ########
-        ######.#
-        .####..#
-        .###.#..
-    """).strip(), cycles=6, dimensions=4))
+    with open(f"{dirname(__file__)}/input.txt") as f:
+        print(puzzle(f.read().strip(), cycles=6, dimensions=4))
@@ -4,9 +4,11 @@ from __future__ import annotations
 import re
 from operator import add, mul
 from os.path import dirname
-from typing import Iterator, Union
+from typing import Iterable, Iterator, Union
 from unittest import TestCase
 
+from aoc.inputs import lines
+
 OPERATORS = {"+": add, "*": mul}
 TOKEN = re.compile(r"[*+]|\d+|[()]")
 
@@ -14,10 +16,10 @@ Expression = list[Union[int, str, "Expression"]]
 SimpleExpression = list[Union[int, str]]
 
 
-def puzzle(expressions: str) -> int:
+def puzzle(expressions: Iterable[str]) -> int:
     return sum(
         evaluate(iter(TOKEN.findall(line)))
-        for line in expressions.split("\n")
+        for line in expressions
     )
 
 
@@ -75,9 +77,8 @@ class PuzzleTests(TestCase):
             ("((2 + 4 * 9) * (6 + 9 * 8 + 6) + 6) + 2 + 4 * 2", 23340),
         ]:
             with self.subTest(expression=expression):
-                self.assertEqual(value, puzzle(expression))
+                self.assertEqual(value, puzzle([expression]))
 
 
 if __name__ == "__main__":
-    with open(f"{dirname(__file__)}/input.txt") as f:
-        print(puzzle(f.read().strip()))
+    print(puzzle(lines(f"{dirname(__file__)}/input.txt")))
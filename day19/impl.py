@@ -1,26 +1,44 @@
 #!/usr/bin/env python3
 import re
 from ast import literal_eval
+from itertools import takewhile
 from os.path import dirname
 from textwrap import dedent
-from typing import Union
+from typing import Iterable, Union
 from unittest import TestCase
 
+from aoc.cache import CacheStats, memoize
+from aoc.inputs import lines
+
 RuleMap = dict[int, Union[list[list[int]], str]]
 
 
-def puzzle(data: str) -> int:
-    rules, messages = data.split("\n\n")
-    rule_zero = resolve(rules.split("\n"))
+def puzzle(data: Iterable[str]) -> int:
+    """Rules come first, then a blank line, then the messages."""
+    data = iter(data)
+    return solve((build_map(takewhile(bool, data)), data))
+
+
+def parse(data: Iterable[str]) -> tuple[RuleMap, list[str]]:
+    data = iter(data)
+    return build_map(takewhile(bool, data)), list(data)
+
+
+def solve(parsed: tuple[RuleMap, Iterable[str]]) -> int:
+    rule_map, messages = parsed
+    rule_zero = resolve(rule_map)
     return sum(
         rule_zero.match(message) is not None
-        for message in messages.split("\n")
+        for message in messages
     )
 
 
-def resolve(rules: list[str]) -> re.Pattern:
-    rule_map = build_map(rules)
+def resolve(rule_map: RuleMap) -> re.Pattern:
+    return resolve_with_stats(rule_map)[0]
 
+
+def resolve_with_stats(rule_map: RuleMap) -> tuple[re.Pattern, CacheStats]:
+    """Build rule 0's pattern, with the hit, miss and eviction counts of the sub-rule cache."""
     @memoize
     def find_rule(index: int) -> str:
         rule = rule_map[index]
@@ -30,10 +48,10 @@ def resolve(rules: list[str]) -> re.Pattern:
             return "".join(find_rule(i) for i in rule[0])
         return f"(?:{'|'.join(''.join(find_rule(i) for i in part) for part in rule)})"
 
-    return re.compile(f"^{find_rule(0)}$")
+    return re.compile(f"^{find_rule(0)}$"), find_rule.stats()
 
 
-def build_map(rules: list[str]) -> RuleMap:
+def build_map(rules: Iterable[str]) -> RuleMap:
     rule_map: RuleMap = dict()
     for line in rules:
         index, rule = line.split(":")
@@ -47,15 +65,6 @@ def build_map(rules: list[str]) -> RuleMap:
     return rule_map
 
 
-def memoize(func):
-    def wrapper(*args):
-        if args not in wrapper._cache:
-            wrapper._cache[args] = func(*args)
-        return wrapper._cache[args]
-    wrapper._cache = dict()
-    return wrapper
-
-
 class PuzzleTests(TestCase):
 
     example = dedent("""
@@ -74,9 +83,16 @@ class PuzzleTests(TestCase):
     """).strip()
 
     def test_puzzle(self):
-        self.assertEqual(2, puzzle(self.example))
+        self.assertEqual(2, puzzle(self.example.split("\n")))
+
+    def test_resolve_with_stats(self):
+        rule_map, _ = parse(self.example.split("\n"))
+        pattern, stats = resolve_with_stats(rule_map)
+        self.assertEqual(pattern.pattern, resolve(rule_map).pattern)
+        self.assertEqual(6, stats.misses)
+        self.assertEqual(10, stats.hits)
+        self.assertEqual(0, stats.evictions)
 
 
 if __name__ == "__main__":
-    with open(f"{dirname(__file__)}/input.txt") as f:
-        print(puzzle(f.read().strip()))
+    print(puzzle(lines(f"{dirname(__file__)}/input.txt")))
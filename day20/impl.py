@@ -15,9 +15,10 @@ class Tile:
     ONE = "#"
     ZERO = "."
 
-    def __init__(self, id_: int, borders: tuple[int, int, int, int]):
+    def __init__(self, id_: int, borders: tuple[int, int, int, int], edge_length: int = EDGE_LENGTH):
         self.id_ = id_
         self.borders = borders
+        self.edge_length = edge_length
         self._flips: dict[tuple[bool, bool], Tile] = dict()
 
     def __eq__(self, other: Any) -> bool:
@@ -38,7 +39,7 @@ class Tile:
                 top, right, bottom, left = bottom, self._flip(right), top, self._flip(left)
             if horizontally:
                 top, right, bottom, left = self._flip(top), left, self._flip(bottom), right
-            self._flips[vertically, horizontally] = Tile(self.id_, (top, right, bottom, left))
+            self._flips[vertically, horizontally] = Tile(self.id_, (top, right, bottom, left), self.edge_length)
         return self._flips[vertically, horizontally]
 
     @classmethod
@@ -50,24 +51,30 @@ class Tile:
             cls._calculate_border(content[-1]),
             cls._calculate_border(row[0] for row in content),
         )
-        return cls(int(identity.split()[1][:-1]), borders)
+        return cls(int(identity.split()[1][:-1]), borders, len(content[0]))
 
     @classmethod
     def _calculate_border(cls, chars: Iterable[str]):
         return int("".join("1" if char == cls.ONE else "0" for char in chars), 2)
 
-    @classmethod
-    def _flip(cls, border: int) -> int:
+    def _flip(self, border: int) -> int:
         """https://stackoverflow.com/a/5333563/3001761"""
         return sum(
-            1 << (cls.EDGE_LENGTH - 1 - i)
-            for i in range(cls.EDGE_LENGTH)
+            1 << (self.edge_length - 1 - i)
+            for i in range(self.edge_length)
             if border >> i & 1
         )
 
 
 def puzzle(data: str) -> int:
-    tiles = [Tile.from_string(tile) for tile in data.split("\n\n")]
+    return solve(parse(data))
+
+
+def parse(data: str) -> list[Tile]:
+    return [Tile.from_string(tile) for tile in data.split("\n\n")]
+
+
+def solve(tiles: list[Tile]) -> int:
     connections = _get_connections(tiles)
     corners = [tile for tile in connections if len(connections[tile]) == 2]
     return reduce(mul, (tile.id_ for tile in corners), 1)
@@ -2,13 +2,16 @@
 from collections import defaultdict
 from os.path import dirname
 from textwrap import dedent
+from typing import Iterable
 from unittest import TestCase
 
+from aoc.inputs import lines
 
-def puzzle(data: str) -> int:
+
+def puzzle(data: Iterable[str]) -> int:
     all_allergens: dict[str, list[list[str]]] = defaultdict(list)
     all_ingredients: list[str] = list()
-    for row in data.split("\n"):
+    for row in data:
         ingredients, allergens = row.strip().split("(contains ")
         new_ingredients = ingredients.strip().split()
         all_ingredients.extend(new_ingredients)
@@ -36,9 +39,8 @@ class PuzzleTests(TestCase):
     """).strip()
 
     def test_puzzle(self):
-        self.assertEqual(5, puzzle(self.example))
+        self.assertEqual(5, puzzle(self.example.split("\n")))
 
 
 if __name__ == "__main__":
-    with open(f"{dirname(__file__)}/input.txt") as f:
-        print(puzzle(f.read().strip()))
+    print(puzzle(lines(f"{dirname(__file__)}/input.txt")))
@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+from os.path import dirname
 from unittest import TestCase
 
 
@@ -45,4 +46,5 @@ class PuzzleTests(TestCase):
 
 
 if __name__ == "__main__":
-    print(puzzle("784235916"))
+    with open(f"{dirname(__file__)}/input.txt") as f:
+        print(puzzle(f.read().strip()))